@@ -4,6 +4,8 @@ import os
 from lucidmind.analysis.phase import PhaseAnalyzer
 from lucidmind.visualization.phase_diagram import plot_phase_diagram
 from lucidmind.config.loader import load_config
+from lucidmind.experiments.cache import ResultCache
+from lucidmind.experiments.queue import JobQueue
 
 def main():
     parser = argparse.ArgumentParser(description="Generate 2D phase diagram")
@@ -12,22 +14,52 @@ def main():
     parser.add_argument("--p2", type=str, default="beta", help="Parameter 2")
     parser.add_argument("--p2_range", type=float, nargs=3, default=[0.01, 0.15, 5], help="min max steps")
     parser.add_argument("--runs", type=int, default=5, help="Runs per point")
+    parser.add_argument("--max-runs", type=int, default=None, help="Add runs per point until its class is decided, up to this many")
     parser.add_argument("--steps", type=int, default=500, help="Timesteps per run")
+    parser.add_argument("--ensemble", action="store_true", help="Simulate each grid row in one lockstep KernelEnsemble")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all CPUs)")
+    parser.add_argument("--cache", type=str, default=None, help="Result cache directory (reuses finished runs)")
+    parser.add_argument("--queue", type=str, default=None, help="SQLite job queue; a restarted sweep skips finished runs")
+    parser.add_argument("--early-stop", action="store_true", help="Stop runs once they are classified as COLLAPSE or EXPLOSION")
+    parser.add_argument("--adaptive", action="store_true", help="Refine cells near phase boundaries (the range steps set the coarse grid)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum refinement depth for --adaptive")
     parser.add_argument("--out", type=str, default="phase_diagram.png", help="Output plot path")
     args = parser.parse_args()
+    if args.adaptive and args.ensemble:
+        parser.error("--ensemble is not supported with --adaptive")
+    if args.adaptive and args.max_runs is not None:
+        parser.error("--max-runs is not supported with --adaptive")
     
     config = load_config()
-    analyzer = PhaseAnalyzer(config)
+    if args.early_stop:
+        config['early_stop'] = True
+    cache = ResultCache(args.cache) if args.cache else None
+    queue = JobQueue(args.queue) if args.queue else None
+    analyzer = PhaseAnalyzer(config, cache=cache, queue=queue)
     
-    r1 = np.linspace(args.p1_range[0], args.p1_range[1], int(args.p1_range[2]))
-    r2 = np.linspace(args.p2_range[0], args.p2_range[1], int(args.p2_range[2]))
-    
-    results = analyzer.sweep_2d(
-        args.p1, r1,
-        args.p2, r2,
-        n_runs=args.runs,
-        T=args.steps
-    )
+    if args.adaptive:
+        results = analyzer.sweep_adaptive(
+            args.p1, tuple(args.p1_range[:2]),
+            args.p2, tuple(args.p2_range[:2]),
+            coarse=(int(args.p1_range[2]), int(args.p2_range[2])),
+            max_depth=args.depth,
+            n_runs=args.runs,
+            T=args.steps,
+            workers=args.workers
+        )
+    else:
+        r1 = np.linspace(args.p1_range[0], args.p1_range[1], int(args.p1_range[2]))
+        r2 = np.linspace(args.p2_range[0], args.p2_range[1], int(args.p2_range[2]))
+        
+        results = analyzer.sweep_2d(
+            args.p1, r1,
+            args.p2, r2,
+            n_runs=args.runs,
+            T=args.steps,
+            use_ensemble=args.ensemble,
+            workers=args.workers,
+            max_runs=args.max_runs
+        )
     
     plot_phase_diagram(results, save_path=args.out)
     
@@ -0,0 +1,66 @@
+import argparse
+import sys
+from lucidmind.experiments.benchmark import (
+    run_suite, save_results, load_results, compare_results, git_commit
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with per-commit results and regression checks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the suite and record it under the current commit")
+    run.add_argument("--out", type=str, default="benchmarks.json", help="Results file (one entry per commit)")
+    run.add_argument("--quick", action="store_true", help="Reduced size grid")
+    run.add_argument("--engine", choices=["list", "bank"], nargs="+", default=["list", "bank"], help="Kernel rule engines")
+    run.add_argument("--only", type=str, default=None, help="Only benchmarks whose name contains this string")
+    run.add_argument("--commit", type=str, default=None, help="Key to store results under (default: git HEAD)")
+
+    compare = sub.add_parser("compare", help="Compare two recorded commits")
+    compare.add_argument("--results", type=str, default="benchmarks.json", help="Results file")
+    compare.add_argument("base", nargs="?", help="Reference commit (default: second most recent)")
+    compare.add_argument("head", nargs="?", help="Commit under test (default: most recent)")
+    compare.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        commit = args.commit or git_commit()
+        print(f"Running benchmarks at {commit}")
+        results = run_suite(quick=args.quick, engines=tuple(args.engine), only=args.only)
+        save_results(args.out, commit, results)
+        print(f"Recorded {len(results)} benchmarks under {commit} in {args.out}")
+
+    elif args.command == "compare":
+        history = load_results(args.results)
+        by_time = sorted(history, key=lambda c: history[c]['timestamp'])
+        head = args.head or by_time[-1]
+        base = args.base or (by_time[-2] if len(by_time) > 1 else None)
+        if base is None:
+            sys.exit(f"{args.results} holds a single commit; nothing to compare")
+        for commit in (base, head):
+            if commit not in history:
+                sys.exit(f"No results for commit {commit} in {args.results}")
+
+        rows = compare_results(history[base]['results'], history[head]['results'], args.threshold)
+        print(f"{base} -> {head} (threshold {args.threshold:.0%})")
+        print(f"{'benchmark':<55} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+        def ms(seconds):
+            return f"{'-':>10}" if seconds is None else f"{seconds * 1e3:>10.3f}"
+
+        for row in rows:
+            flag = {
+                'regression': '  REGRESSION', 'improvement': '  faster', 'missing': '  MISSING', 'new': '  new'
+            }.get(row['status'], '')
+            ratio = f"{'-':>7}" if row['ratio'] is None else f"{row['ratio']:>7.2f}"
+            print(f"{row['name']:<55} {ms(row['base'])} {ms(row['head'])} {ratio}{flag}")
+
+        regressions = [row for row in rows if row['status'] == 'regression']
+        missing = [row for row in rows if row['status'] == 'missing']
+        compared = sum(row['status'] not in ('missing', 'new') for row in rows)
+        print(f"{len(regressions)} regressions in {compared} benchmarks")
+        if missing:
+            print(f"{len(missing)} benchmarks of {base} missing from {head}")
+        if regressions or missing:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+from lucidmind.analysis.nd_sweep import (
+    make_manifest, save_manifest, load_manifest, split_manifest, run_manifest, merge_results
+)
+from lucidmind.config.loader import load_config
+from lucidmind.experiments.cache import ResultCache
+
+def main():
+    parser = argparse.ArgumentParser(description="N-D space-filling parameter sweeps with shardable manifests")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    plan = sub.add_parser("plan", help="Sample a design and write its manifest")
+    plan.add_argument("--config", type=str, help="Path to base config YAML")
+    plan.add_argument("--param", nargs=3, action="append", metavar=("NAME", "LOW", "HIGH"), required=True,
+                      help="Swept parameter and its bounds (repeat for each dimension)")
+    plan.add_argument("--log", nargs="*", default=[], help="Parameters sampled in log space")
+    plan.add_argument("--points", type=int, default=64, help="Number of design points")
+    plan.add_argument("--method", choices=["lhs", "sobol"], default="lhs", help="Sampling design")
+    plan.add_argument("--design-seed", type=int, default=0, help="Seed of the design sampler")
+    plan.add_argument("--runs", type=int, default=5, help="Runs per point")
+    plan.add_argument("--steps", type=int, default=1000, help="Timesteps per run")
+    plan.add_argument("--out", type=str, default="manifest.json", help="Manifest path")
+    
+    split = sub.add_parser("split", help="Write one manifest per shard")
+    split.add_argument("manifest", type=str)
+    split.add_argument("--shards", type=int, required=True, help="Number of shards")
+    
+    run = sub.add_parser("run", help="Run the jobs of one (shard) manifest")
+    run.add_argument("manifest", type=str)
+    run.add_argument("--results", type=str, default=None, help="Results JSONL (default: next to the manifest)")
+    run.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all CPUs)")
+    run.add_argument("--cache", type=str, default=None, help="Result cache directory (reuses finished runs)")
+    
+    merge = sub.add_parser("merge", help="Combine shard results into one result set")
+    merge.add_argument("manifest", type=str)
+    merge.add_argument("results", nargs="+", help="Shard results JSONL files")
+    merge.add_argument("--out", type=str, default="nd_sweep.json", help="Merged results path")
+    args = parser.parse_args()
+    
+    if args.command == "plan":
+        config = load_config(args.config) if args.config else load_config()
+        bounds = {name: (float(low), float(high)) for name, low, high in args.param}
+        manifest = make_manifest(config, bounds, args.points, n_runs=args.runs, T=args.steps,
+                                 method=args.method, seed=args.design_seed, log_params=args.log)
+        save_manifest(manifest, args.out)
+        print(f"Manifest {manifest['manifest_id']}: {args.points} points x {args.runs} runs -> {args.out}")
+        
+    elif args.command == "split":
+        manifest = load_manifest(args.manifest)
+        base = os.path.splitext(args.manifest)[0]
+        for shard in split_manifest(manifest, args.shards):
+            path = f"{base}.shard{shard['shard'][0]}-of-{args.shards}.json"
+            save_manifest(shard, path)
+            print(f"  {path}")
+            
+    elif args.command == "run":
+        manifest = load_manifest(args.manifest)
+        results = args.results or os.path.splitext(args.manifest)[0] + ".results.jsonl"
+        cache = ResultCache(args.cache) if args.cache else None
+        run_manifest(manifest, results, cache=cache, workers=args.workers)
+        print(f"Results in {results}")
+        
+    elif args.command == "merge":
+        merged = merge_results(load_manifest(args.manifest), args.results)
+        with open(args.out, 'w') as f:
+            json.dump(merged, f, indent=2)
+        print(f"Merged {len(merged['points'])} points ({len(merged['missing'])} jobs missing) -> {args.out}")
+
+if __name__ == "__main__":
+    main()
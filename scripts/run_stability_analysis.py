@@ -3,27 +3,43 @@ import os
 import numpy as np
 import yaml
 from lucidmind.experiments.runner import ExperimentRunner
+from lucidmind.experiments.parallel import derive_seeds
 from lucidmind.analysis.stability import compute_stability_report
 from lucidmind.config.loader import load_config
+from lucidmind.experiments.cache import ResultCache
+from lucidmind.core.profiling import merge_profiles, format_profile
 
 def main():
     parser = argparse.ArgumentParser(description="Run stability analysis for a single configuration")
     parser.add_argument("--config", type=str, help="Path to experimental config YAML")
     parser.add_argument("--runs", type=int, default=10, help="Number of runs")
     parser.add_argument("--steps", type=int, default=1000, help="Timesteps per run")
+    parser.add_argument("--ensemble", action="store_true", help="Run all seeds in one lockstep KernelEnsemble")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all CPUs)")
+    parser.add_argument("--cache", type=str, default=None, help="Result cache directory (reuses finished runs)")
+    parser.add_argument("--early-stop", action="store_true", help="Stop runs once they are classified as COLLAPSE or EXPLOSION")
+    parser.add_argument("--profile", action="store_true", help="Time the kernel phases and print a summary")
     args = parser.parse_args()
+    if args.profile and args.ensemble:
+        parser.error("--profile is not supported with --ensemble (KernelEnsemble has no profiler)")
     
     config = load_config(args.config) if args.config else load_config()
     config['T'] = args.steps
+    if args.early_stop:
+        config['early_stop'] = True
+    if args.profile:
+        config['profile'] = True
     
-    runner = ExperimentRunner(config)
+    cache = ResultCache(args.cache) if args.cache else None
+    runner = ExperimentRunner(config, cache=cache)
     print(f"Running stability analysis for: {config}")
     
-    run_metrics = []
-    for i in range(args.runs):
-        print(f"  Run {i+1}/{args.runs}...")
-        metrics = runner.run_metrics_only(seed=100+i)
-        run_metrics.append(metrics)
+    seeds = derive_seeds(100, args.runs)
+    if args.ensemble:
+        print(f"  Running {args.runs} seeds in lockstep...")
+        run_metrics = runner.run_metrics_ensemble(seeds)
+    else:
+        run_metrics = runner.run_metrics_batch(seeds, workers=args.workers)
         
     report = compute_stability_report(run_metrics)
     
@@ -39,6 +55,11 @@ def main():
     print(f"Avg Stability Window: [{report['avg_stability_window'][0]:.2f}, {report['avg_stability_window'][1]:.2f}]")
     print(f"OVERALL STATUS: {'PASS' if report['passed'] else 'FAIL'}")
     print("="*40)
+    
+    profiles = [m['profile'] for m in run_metrics if 'profile' in m]
+    if profiles:
+        print(f"\nKERNEL PROFILE ({len(profiles)} runs)")
+        print(format_profile(merge_profiles(profiles)))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,167 @@
+import numpy as np
+from collections import Counter
+from typing import Dict, List, Any, Optional
+from ..experiments.runner import run_metrics_resume_task
+from ..experiments.parallel import derive_seeds, run_tasks
+from ..experiments.cache import ResultCache
+from .stability import classify_run, compute_stability_report
+from .sequential import mode_decided
+from .phase import PhaseAnalyzer
+
+
+def horizon_ladder(T: int, min_T: int = 100, eta: int = 2) -> List[int]:
+    """
+    Horizons T / eta**k down to min_T, shortest first, ending at T.
+    """
+    horizons = [int(T)]
+    while horizons[0] // eta >= min_T:
+        horizons.insert(0, horizons[0] // eta)
+    return horizons
+
+
+class SuccessiveHalvingSweeper:
+    """
+    Multi-fidelity sweeps: every point starts at a short horizon and only
+    points whose class is still open advance to the next, eta times longer
+    horizon.
+
+    A point is decided early when the mode of its runs is EXPLOSION or
+    COLLAPSE and passes mode_decided at `confidence`; STABLE and UNSTABLE
+    points can still change, so they continue until the full T. Surviving
+    runs are resumed from their kernel state (or from the ResultCache
+    checkpoints), never restarted, so a point that reaches T has exactly
+    the histories of a fixed-horizon sweep.
+    """
+    def __init__(self, base_config: Dict[str, Any], cache: Optional[ResultCache] = None):
+        self.base_config = base_config
+        self.cache = cache
+        self._phase = PhaseAnalyzer(base_config, cache=cache)
+
+    def run_points(
+        self,
+        point_configs: List[Dict[str, Any]],
+        n_runs: int = 5,
+        T: int = 1000,
+        min_T: int = 100,
+        eta: int = 2,
+        confidence: float = 0.95,
+        workers: Optional[int] = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs the horizon ladder for a list of point configs.
+
+        Returns:
+            Per point: 'metrics' and 'classes' of its runs at the horizon
+            where it was decided, and that horizon as 'decided_at'
+        """
+        seeds = derive_seeds(42, n_runs)
+        horizons = horizon_ladder(T, min_T, eta)
+        points = [{'metrics': None, 'classes': None, 'decided_at': None} for _ in point_configs]
+        states: List[List[Any]] = [[None] * n_runs for _ in point_configs]
+        active = list(range(len(point_configs)))
+
+        for rung, horizon in enumerate(horizons):
+            final = rung == len(horizons) - 1
+            print(f"  Horizon T={horizon}: {len(active)} of {len(point_configs)} points")
+            tasks = [
+                ({**point_configs[p], 'T': horizon}, seed, self.cache, states[p][r])
+                for p in active for r, seed in enumerate(seeds)
+            ]
+            outputs = run_tasks(run_metrics_resume_task, tasks, workers=workers, desc=f"T={horizon}")
+
+            still_open = []
+            for k, p in enumerate(active):
+                block = outputs[k * n_runs:(k + 1) * n_runs]
+                metrics = [m for m, _ in block]
+                classes = [classify_run(m) for m in metrics]
+                mode = Counter(classes).most_common(1)[0][0]
+                if final or (mode in ("EXPLOSION", "COLLAPSE") and mode_decided(classes, confidence)):
+                    points[p] = {'metrics': metrics, 'classes': classes, 'decided_at': horizon}
+                else:
+                    states[p] = [state for _, state in block]
+                    still_open.append(p)
+            active = still_open
+            if not active:
+                break
+
+        n_steps = sum(len(m['complexity_history']) for pt in points for m in pt['metrics'])
+        print(f"Simulated {n_steps} of {len(point_configs) * n_runs * T} steps")
+        return points
+
+    def sweep_1d(
+        self,
+        param_name: str,
+        values: List[Any],
+        n_runs: int = 10,
+        T: int = 1000,
+        min_T: int = 100,
+        eta: int = 2,
+        confidence: float = 0.95,
+        workers: Optional[int] = 1
+    ) -> Dict[str, Any]:
+        """
+        ParameterSweeper.sweep_1d layout, plus 'decided_at' per value.
+        """
+        print(f"Starting successive-halving 1D sweep for {param_name} across {len(values)} values")
+        configs = [{**self.base_config, param_name: val} for val in values]
+        points = self.run_points(configs, n_runs, T, min_T, eta, confidence, workers)
+
+        results = []
+        for val, point in zip(values, points):
+            report = compute_stability_report(point['metrics'])
+            results.append({
+                'value': val,
+                'stable_pct': report['percentages']['STABLE'],
+                'explosion_pct': report['percentages']['EXPLOSION'],
+                'collapse_pct': report['percentages']['COLLAPSE'],
+                'avg_window': report['avg_stability_window'],
+                'n_runs': n_runs,
+                'decided_at': point['decided_at']
+            })
+            print(f"  {param_name}={val}: stable={report['percentages']['STABLE']:.2f} (decided at T={point['decided_at']})")
+
+        return {
+            'parameter': param_name,
+            'values': values,
+            'results': results
+        }
+
+    def sweep_2d(
+        self,
+        param1: str, range1: np.ndarray,
+        param2: str, range2: np.ndarray,
+        n_runs: int = 5,
+        T: int = 1000,
+        min_T: int = 100,
+        eta: int = 2,
+        confidence: float = 0.95,
+        workers: Optional[int] = 1
+    ) -> Dict[str, Any]:
+        """
+        PhaseAnalyzer.sweep_2d layout, plus a 'decided_at' horizon grid.
+        """
+        print(f"Starting successive-halving 2D sweep: {param1} vs {param2}")
+        configs = []
+        for val1 in range1:
+            for val2 in range2:
+                configs.append({**self.base_config, param1: val1, param2: val2})
+        points = self.run_points(configs, n_runs, T, min_T, eta, confidence, workers)
+
+        shape = (len(range1), len(range2))
+        grid = np.zeros(shape, dtype=int)
+        conf = np.zeros(shape, dtype=float)
+        decided_at = np.zeros(shape, dtype=int)
+        for k, (i, j) in enumerate(np.ndindex(*shape)):
+            grid[i, j], conf[i, j] = self._phase._summarize(points[k]['classes'])
+            decided_at[i, j] = points[k]['decided_at']
+
+        return {
+            'param1': param1,
+            'param2': param2,
+            'range1': np.asarray(range1).tolist(),
+            'range2': np.asarray(range2).tolist(),
+            'grid': grid.tolist(),
+            'confidence': conf.tolist(),
+            'decided_at': decided_at.tolist(),
+            'class_map': self._phase.inv_class_map
+        }
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import numpy as np
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+from scipy.stats import qmc
+from ..experiments.runner import run_metrics_task
+from ..experiments.parallel import derive_seeds, run_tasks
+from ..experiments.cache import ResultCache, canonical_config
+from .stability import classify_run
+
+MANIFEST_VERSION = 1
+
+
+def sample_design(
+    bounds: Dict[str, Tuple[float, float]],
+    n_points: int,
+    method: str = 'lhs',
+    seed: int = 0,
+    log_params: Optional[List[str]] = None,
+    integer_params: Optional[List[str]] = None
+) -> np.ndarray:
+    """
+    Space-filling sample of an N-D box of parameters.
+
+    Args:
+        bounds: Parameter name -> (low, high); column order follows the dict
+        n_points: Number of points (a power of two keeps Sobol balanced)
+        method: 'lhs' (Latin hypercube) or 'sobol' (scrambled Sobol)
+        seed: Seed of the sampler's scrambling/permutations
+        log_params: Parameters sampled uniformly in log space
+        integer_params: Parameters rounded to whole numbers in [low, high]
+
+    Returns:
+        (n_points, len(bounds)) array of parameter values
+    """
+    d = len(bounds)
+    if method == 'lhs':
+        unit = qmc.LatinHypercube(d=d, seed=seed).random(n_points)
+    elif method == 'sobol':
+        unit = qmc.Sobol(d=d, scramble=True, seed=seed).random(n_points)
+    else:
+        raise ValueError(f"Unknown design method '{method}' (expected 'lhs' or 'sobol')")
+
+    log_params = set(log_params or [])
+    integer_params = set(integer_params or [])
+    points = np.empty_like(unit)
+    for k, (name, (low, high)) in enumerate(bounds.items()):
+        if name in integer_params:
+            low, high = np.ceil(low), np.floor(high)
+            if low > high:
+                raise ValueError(f"Bounds of integer parameter '{name}' contain no integer")
+            # Widen by half a step so rounding gives the end values full-width cells
+            low, high = low - 0.5, high + 0.5
+            if name in log_params:
+                low = max(low, 0.5)
+        if name in log_params:
+            points[:, k] = np.exp(np.log(low) + unit[:, k] * (np.log(high) - np.log(low)))
+        else:
+            points[:, k] = low + unit[:, k] * (high - low)
+        if name in integer_params:
+            points[:, k] = np.clip(np.round(points[:, k]), low + 0.5, high - 0.5)
+    return points
+
+
+def integer_params(base_config: Dict[str, Any], bounds: Dict[str, Tuple[float, float]]) -> List[str]:
+    """
+    Swept parameters that must be whole numbers: those whose base value is
+    an int (e.g. N, birth_window, bad_steps_to_birth) or whose bounds are
+    both ints.
+    """
+    def is_int(value: Any) -> bool:
+        return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+    merged = canonical_config(base_config)
+    return [
+        name for name, (low, high) in bounds.items()
+        if is_int(merged.get(name)) or (is_int(low) and is_int(high))
+    ]
+
+
+def _manifest_id(manifest: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {k: manifest[k] for k in ('base_config', 'params', 'T', 'points', 'seeds')},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def make_manifest(
+    base_config: Dict[str, Any],
+    bounds: Dict[str, Tuple[float, float]],
+    n_points: int,
+    n_runs: int = 5,
+    T: int = 1000,
+    method: str = 'lhs',
+    seed: int = 0,
+    log_params: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Plans an N-D sweep: n_points design points x n_runs seeds.
+
+    Job j is point j // n_runs with seed j % n_runs, so the job list can be
+    cut into shards without storing it. Integer parameters (see
+    integer_params) are sampled on whole numbers and stored as ints.
+    """
+    ints = integer_params(base_config, bounds)
+    points = sample_design(bounds, n_points, method, seed, log_params, ints)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'base_config': canonical_config(base_config),
+        'params': list(bounds),
+        'bounds': {k: list(v) for k, v in bounds.items()},
+        'method': method,
+        'design_seed': seed,
+        'T': T,
+        'points': [
+            [int(v) if name in ints else float(v) for name, v in zip(bounds, row)]
+            for row in points
+        ],
+        'seeds': derive_seeds(42, n_runs),
+        'shard': [0, 1]
+    }
+    manifest['manifest_id'] = _manifest_id(manifest)
+    return manifest
+
+
+def save_manifest(manifest: Dict[str, Any], path: str):
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version {manifest.get('version')}")
+    return manifest
+
+
+def split_manifest(manifest: Dict[str, Any], n_shards: int) -> List[Dict[str, Any]]:
+    """
+    Splits a manifest into n_shards manifests for separate machines.
+
+    Shard k runs jobs k, k + n_shards, ...; interleaving spreads the design
+    evenly so every shard samples the whole space.
+    """
+    return [{**manifest, 'shard': [k, n_shards]} for k in range(n_shards)]
+
+
+def manifest_jobs(manifest: Dict[str, Any]) -> List[int]:
+    """Job ids belonging to the manifest's shard."""
+    k, n_shards = manifest['shard']
+    n_jobs = len(manifest['points']) * len(manifest['seeds'])
+    return list(range(k, n_jobs, n_shards))
+
+
+def run_job_task(task) -> Dict[str, Any]:
+    """Process-pool entry point: runs and summarizes one manifest job."""
+    config, seed, cache, job = task
+    metrics = run_metrics_task((config, seed, cache))
+    comp = np.asarray(metrics['complexity_history'])
+    return {
+        'job': job,
+        'seed': seed,
+        'class': classify_run(metrics),
+        'damping_ratio': metrics['damping_ratio'],
+        'born_total': metrics['born_total'],
+        'alive_count': metrics['alive_count'],
+        'mean_complexity': float(comp.mean()) if len(comp) else 0.0,
+        'final_complexity': int(comp[-1]) if len(comp) else 0
+    }
+
+
+def run_manifest(
+    manifest: Dict[str, Any],
+    results_path: str,
+    cache: Optional[ResultCache] = None,
+    workers: Optional[int] = 1,
+    block_size: int = 256
+) -> str:
+    """
+    Runs the manifest's shard and appends one JSON line per job.
+
+    Results are written every block_size jobs, and jobs already present in
+    results_path are skipped, so an interrupted shard can be rerun with the
+    same command.
+    """
+    done = {r['job'] for r in _read_results(results_path)} if os.path.exists(results_path) else set()
+    seeds = manifest['seeds']
+    params = manifest['params']
+    tasks = []
+    for job in manifest_jobs(manifest):
+        if job in done:
+            continue
+        point = manifest['points'][job // len(seeds)]
+        config = {**manifest['base_config'], **dict(zip(params, point)), 'T': manifest['T']}
+        tasks.append((config, seeds[job % len(seeds)], cache, job))
+
+    k, n_shards = manifest['shard']
+    print(f"Shard {k + 1}/{n_shards}: {len(tasks)} jobs to run, {len(done)} already done")
+    for start in range(0, len(tasks), block_size):
+        block = tasks[start:start + block_size]
+        results = run_tasks(run_job_task, block, workers=workers, desc=f"Jobs {start + len(block)}/{len(tasks)}", unit="jobs")
+        with open(results_path, 'a') as f:
+            for result in results:
+                f.write(json.dumps({'manifest_id': manifest['manifest_id'], **result}) + "\n")
+    return results_path
+
+
+def _read_results(path: str) -> List[Dict[str, Any]]:
+    results = []
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Blank or partially written line (e.g. after a crash)
+                continue
+    return results
+
+
+def merge_results(manifest: Dict[str, Any], results_paths: List[str]) -> Dict[str, Any]:
+    """
+    Combines shard outputs into one per-point result set.
+
+    Results from other manifests are rejected; duplicate jobs (e.g. a
+    shard run twice) are counted once.
+
+    Returns:
+        Dict with 'params', per-point 'points' ([values...]), 'classes'
+        (mode class), 'stable_pct', 'counts' and 'n_runs', plus 'missing'
+        job ids that no shard reported
+    """
+    jobs: Dict[int, Dict[str, Any]] = {}
+    for path in results_paths:
+        for result in _read_results(path):
+            if result['manifest_id'] != manifest['manifest_id']:
+                raise ValueError(f"{path} belongs to manifest {result['manifest_id']}, not {manifest['manifest_id']}")
+            jobs.setdefault(result['job'], result)
+
+    n_runs = len(manifest['seeds'])
+    n_points = len(manifest['points'])
+    per_point: List[List[Dict[str, Any]]] = [[] for _ in range(n_points)]
+    for job in sorted(jobs):
+        per_point[job // n_runs].append(jobs[job])
+
+    classes, stable_pct, counts, runs = [], [], [], []
+    for results in per_point:
+        c = Counter(r['class'] for r in results)
+        classes.append(c.most_common(1)[0][0] if results else None)
+        stable_pct.append(c['STABLE'] / len(results) if results else None)
+        counts.append(dict(c))
+        runs.append(len(results))
+
+    return {
+        'manifest_id': manifest['manifest_id'],
+        'params': manifest['params'],
+        'points': manifest['points'],
+        'classes': classes,
+        'stable_pct': stable_pct,
+        'counts': counts,
+        'n_runs': runs,
+        'missing': sorted(set(range(n_points * n_runs)) - set(jobs))
+    }
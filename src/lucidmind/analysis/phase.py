@@ -1,15 +1,29 @@
 import numpy as np
 import os
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, Union
 from .stability import classify_run
 from ..experiments.runner import ExperimentRunner
+from ..experiments.parallel import derive_seeds, run_tasks
+from ..experiments.cache import ResultCache
+from ..experiments.queue import JobQueue
+from .sequential import run_sequential, mode_decided
 
 class PhaseAnalyzer:
     """
     Computes 2D phase diagrams of stability across parameter grids.
+    
+    With a JobQueue, every batch of runs is recorded in its database, so a
+    restarted sweep skips the runs an interrupted one already finished.
     """
-    def __init__(self, base_config: Dict[str, Any]):
+    def __init__(
+        self,
+        base_config: Dict[str, Any],
+        cache: Optional[ResultCache] = None,
+        queue: Optional[JobQueue] = None
+    ):
         self.base_config = base_config
+        self.cache = cache
+        self.queue = queue
         self.class_map = {'STABLE': 0, 'EXPLOSION': 1, 'COLLAPSE': 2, 'UNSTABLE': 3}
         self.inv_class_map = {v: k for k, v in self.class_map.items()}
 
@@ -18,38 +32,81 @@ class PhaseAnalyzer:
         param1: str, range1: np.ndarray, 
         param2: str, range2: np.ndarray,
         n_runs: int = 5,
-        T: int = 1000
+        T: int = 1000,
+        use_ensemble: bool = False,
+        workers: Optional[int] = 1,
+        max_runs: Optional[int] = None,
+        decision_confidence: float = 0.95
     ) -> Dict[str, Any]:
         """
         Sweeps two parameters and classifies the outcome at each point.
+        
+        Every point uses the same n_runs seeds, derived from base seed 42.
+        With use_ensemble=True every row of the grid (all param2 values x
+        n_runs seeds) is simulated in one lockstep KernelEnsemble. Runs (or
+        ensemble rows) are spread over `workers` processes.
+        
+        With max_runs set, replicates are sequential: each point starts with
+        n_runs seeds and gains one seed per round until its mode class is
+        decided at decision_confidence (see sequential.mode_decided) or it
+        reaches max_runs. 'runs_used' records the runs spent per point.
         """
         grid = np.zeros((len(range1), len(range2)), dtype=int)
         confidence = np.zeros((len(range1), len(range2)), dtype=float)
+        runs_used = np.full((len(range1), len(range2)), n_runs, dtype=int)
+        seeds = derive_seeds(42, max(n_runs, max_runs or 0))
         
         print(f"Starting 2D sweep: {param1} vs {param2}")
-        print(f"Grid size: {len(range1)}x{len(range2)}, {n_runs} runs per point")
+        if max_runs is None:
+            print(f"Grid size: {len(range1)}x{len(range2)}, {n_runs} runs per point")
+        else:
+            print(f"Grid size: {len(range1)}x{len(range2)}, {n_runs}-{max_runs} runs per point")
         
-        for i, val1 in enumerate(range1):
-            for j, val2 in enumerate(range2):
+        if max_runs is not None:
+            if use_ensemble:
+                raise ValueError("Sequential replicates (max_runs) do not support use_ensemble")
+            configs = []
+            for val1 in range1:
+                for val2 in range2:
+                    config = self.base_config.copy()
+                    config[param1] = val1
+                    config[param2] = val2
+                    config['T'] = T
+                    configs.append(config)
+            _, point_classes = run_sequential(
+                _classify_task, configs, seeds,
+                decided=lambda c: mode_decided(c, decision_confidence),
+                class_of=lambda c: c,
+                min_runs=n_runs, cache=self.cache, workers=workers, queue=self.queue
+            )
+            for k, (i, j) in enumerate(np.ndindex(len(range1), len(range2))):
+                grid[i, j], confidence[i, j] = self._summarize(point_classes[k])
+                runs_used[i, j] = len(point_classes[k])
+            print(f"Used {runs_used.sum()} of {runs_used.size * len(seeds)} runs")
+        elif use_ensemble:
+            tasks = []
+            for val1 in range1:
                 config = self.base_config.copy()
                 config[param1] = val1
-                config[param2] = val2
                 config['T'] = T
-                
-                runner = ExperimentRunner(config)
-                point_classes = []
-                
-                for r in range(n_runs):
-                    metrics = runner.run_metrics_only(seed=42+r)
-                    cls = classify_run(metrics)
-                    point_classes.append(self.class_map[cls])
-                
-                # Assign mode (most frequent class)
-                counts = np.bincount(point_classes, minlength=4)
-                grid[i, j] = np.argmax(counts)
-                confidence[i, j] = counts[grid[i, j]] / n_runs
-                
-            print(f"  Row {i+1}/{len(range1)} complete")
+                tasks.append((config, param2, list(range2), seeds))
+            rows = run_tasks(_classify_row_task, tasks, workers=workers, desc="Rows", unit="rows", queue=self.queue)
+            classes = [cls for row in rows for cls in row]
+        else:
+            tasks = []
+            for val1 in range1:
+                for val2 in range2:
+                    config = self.base_config.copy()
+                    config[param1] = val1
+                    config[param2] = val2
+                    config['T'] = T
+                    tasks.extend((config, seed, self.cache) for seed in seeds)
+            classes = run_tasks(_classify_task, tasks, workers=workers, desc="Sweep", queue=self.queue)
+        
+        if max_runs is None:
+            # Tasks are ordered row-major, n_runs consecutive runs per point
+            for k, (i, j) in enumerate(np.ndindex(len(range1), len(range2))):
+                grid[i, j], confidence[i, j] = self._summarize(classes[k * n_runs:(k + 1) * n_runs])
 
         return {
             'param1': param1,
@@ -58,9 +115,124 @@ class PhaseAnalyzer:
             'range2': range2.tolist(),
             'grid': grid.tolist(),
             'confidence': confidence.tolist(),
+            'runs_used': runs_used.tolist(),
             'class_map': self.inv_class_map
         }
 
+    def _summarize(self, classes: List[str]) -> Tuple[int, float]:
+        """Returns the mode class id of a point's runs and its share of the runs."""
+        counts = np.bincount([self.class_map[c] for c in classes], minlength=4)
+        mode = int(np.argmax(counts))
+        return mode, counts[mode] / len(classes)
+
+    def sweep_adaptive(
+        self,
+        param1: str, bounds1: Tuple[float, float],
+        param2: str, bounds2: Tuple[float, float],
+        coarse: Union[int, Tuple[int, int]] = 5,
+        max_depth: int = 3,
+        min_confidence: float = 0.8,
+        n_runs: int = 5,
+        T: int = 1000,
+        workers: Optional[int] = 1
+    ) -> Dict[str, Any]:
+        """
+        Boundary-refining sweep: a coarse grid whose cells are subdivided
+        quadtree-style only where the phase is uncertain.
+        
+        Points live on a lattice of (coarse - 1) * 2**max_depth + 1 values
+        per axis; coarse is one point count for both axes or a (param1,
+        param2) pair. Starting from the coarse grid, every cell whose
+        four corners disagree on the class, or whose corners have confidence
+        below min_confidence, is split into four until max_depth. Each level
+        simulates only the points it has not evaluated yet.
+        
+        Returns:
+            sweep_2d-style results on the finest lattice ('grid' and
+            'confidence' are filled from the leaf cells around unevaluated
+            points), plus 'cells' ([x0, x1, y0, y1, class] leaf rectangles),
+            'points' ([v1, v2, class, confidence] for evaluated points),
+            'n_points' and 'n_simulations'
+        """
+        coarse1, coarse2 = (coarse, coarse) if np.ndim(coarse) == 0 else coarse
+        if min(coarse1, coarse2) < 2:
+            raise ValueError("The coarse grid needs at least 2 points per axis")
+        step = 2 ** max_depth
+        size1 = (coarse1 - 1) * step + 1
+        size2 = (coarse2 - 1) * step + 1
+        range1 = np.linspace(bounds1[0], bounds1[1], size1)
+        range2 = np.linspace(bounds2[0], bounds2[1], size2)
+        seeds = derive_seeds(42, n_runs)
+        evaluated: Dict[Tuple[int, int], Tuple[int, float]] = {}
+        
+        print(f"Starting adaptive 2D sweep: {param1} vs {param2}")
+        print(f"Coarse grid {coarse1}x{coarse2}, up to depth {max_depth} ({size1}x{size2} finest), {n_runs} runs per point")
+        
+        cells = [(i, j, step) for i in range(0, size1 - 1, step) for j in range(0, size2 - 1, step)]
+        leaves = []
+        for depth in range(max_depth + 1):
+            needed = sorted({
+                corner for i, j, s in cells
+                for corner in ((i, j), (i + s, j), (i, j + s), (i + s, j + s))
+                if corner not in evaluated
+            })
+            tasks = []
+            for i, j in needed:
+                config = self.base_config.copy()
+                config[param1] = range1[i]
+                config[param2] = range2[j]
+                config['T'] = T
+                tasks.extend((config, seed, self.cache) for seed in seeds)
+            classes = run_tasks(_classify_task, tasks, workers=workers, desc=f"Depth {depth}", queue=self.queue)
+            for k, point in enumerate(needed):
+                evaluated[point] = self._summarize(classes[k * n_runs:(k + 1) * n_runs])
+                
+            refine = []
+            for i, j, s in cells:
+                corners = [evaluated[c] for c in ((i, j), (i + s, j), (i, j + s), (i + s, j + s))]
+                uncertain = len({c for c, _ in corners}) > 1 or min(conf for _, conf in corners) < min_confidence
+                if uncertain and s > 1:
+                    h = s // 2
+                    refine.extend([(i, j, h), (i + h, j, h), (i, j + h, h), (i + h, j + h, h)])
+                else:
+                    leaves.append((i, j, s, corners))
+            cells = refine
+            if not cells:
+                break
+                
+        grid = np.zeros((size1, size2), dtype=int)
+        confidence = np.zeros((size1, size2), dtype=float)
+        cell_list = []
+        for i, j, s, corners in leaves:
+            counts = np.bincount([c for c, _ in corners], minlength=4)
+            cls = int(np.argmax(counts))
+            grid[i:i + s + 1, j:j + s + 1] = cls
+            confidence[i:i + s + 1, j:j + s + 1] = min(conf for _, conf in corners)
+            cell_list.append([float(range1[i]), float(range1[i + s]), float(range2[j]), float(range2[j + s]), cls])
+        for (i, j), (cls, conf) in evaluated.items():
+            grid[i, j] = cls
+            confidence[i, j] = conf
+            
+        n_sims = len(evaluated) * n_runs
+        print(f"Evaluated {len(evaluated)} of {size1 * size2} lattice points ({n_sims} simulations)")
+        
+        return {
+            'param1': param1,
+            'param2': param2,
+            'range1': range1.tolist(),
+            'range2': range2.tolist(),
+            'grid': grid.tolist(),
+            'confidence': confidence.tolist(),
+            'class_map': self.inv_class_map,
+            'cells': cell_list,
+            'points': [
+                [float(range1[i]), float(range2[j]), cls, float(conf)]
+                for (i, j), (cls, conf) in sorted(evaluated.items())
+            ],
+            'n_points': len(evaluated),
+            'n_simulations': n_sims
+        }
+
     def save_results(self, results: Dict, filename: str):
         """
         Saves sweep results as a JSON or NPZ file.
@@ -69,3 +241,17 @@ class PhaseAnalyzer:
         with open(filename, 'w') as f:
             json.dump(results, f, indent=2)
         print(f"Phase diagram results saved to {filename}")
+
+
+def _classify_task(task) -> str:
+    """Process-pool entry point: classifies one (config, seed) run."""
+    config, seed, cache = task
+    return classify_run(ExperimentRunner(config, cache=cache).run_metrics_only(seed=seed))
+
+
+def _classify_row_task(task) -> List[str]:
+    """Process-pool entry point: classifies one grid row run as a KernelEnsemble."""
+    config, param2, range2, seeds = task
+    overrides = [{param2: val2} for val2 in range2 for seed in seeds]
+    row_metrics = ExperimentRunner(config).run_metrics_ensemble(seeds * len(range2), overrides)
+    return [classify_run(m) for m in row_metrics]
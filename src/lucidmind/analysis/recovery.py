@@ -1,7 +1,7 @@
 import numpy as np
-import copy
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from ..core.kernel import Kernel
+from ..core.ensemble import KernelEnsemble
 
 def measure_recovery(
     kernel: Kernel,
@@ -21,8 +21,8 @@ def measure_recovery(
     Returns:
         Dict with recovery metrics
     """
-    k_baseline = copy.deepcopy(kernel)
-    k_perturbed = copy.deepcopy(kernel)
+    k_baseline = kernel.fork()
+    k_perturbed = kernel.fork()
     
     # Apply perturbation
     k_perturbed.S[0] += perturbation_mag
@@ -48,3 +48,109 @@ def measure_recovery(
         'max_divergence': float(np.max(distances)),
         'final_distance': float(distances[-1])
     }
+
+def random_directions(n_directions: int, N: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Returns (n_directions, N) unit vectors drawn uniformly from the sphere."""
+    rng = rng if rng is not None else np.random.default_rng()
+    v = rng.normal(size=(n_directions, N))
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def measure_recovery_ensemble(
+    kernel: Kernel,
+    directions: Optional[np.ndarray] = None,
+    magnitudes: Union[float, Sequence[float]] = 0.01,
+    n_directions: int = 100,
+    n_steps: int = 200,
+    recovery_threshold: float = 0.05,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, Any]:
+    """
+    Batched counterpart of measure_recovery over many perturbations.
+    
+    Clones the kernel into a KernelEnsemble holding one unperturbed
+    baseline plus K = len(directions) * len(magnitudes) perturbed members
+    (direction-major order) and advances them together as a (K + 1, N)
+    array. The ensemble uses common random numbers, so every member sees
+    the baseline's gating draws and noise and the distance to the baseline
+    measures the perturbation alone, not independent noise.
+    
+    The finite-time Lyapunov exponent of member k is
+    log(d_k(n_steps) / d_k(0)) / n_steps; positive values mean the
+    perturbation grew. Members with magnitude 0 get NaN.
+    
+    Args:
+        kernel: Current kernel state (left unchanged)
+        directions: (D, N) perturbation directions (normalized here);
+                    defaults to n_directions random unit vectors
+        magnitudes: Perturbation size(s) applied along every direction
+        n_directions: Number of random directions if directions is None
+        n_steps: How many steps to run for recovery
+        recovery_threshold: Distance below which a member counts as recovered
+        rng: Generator for the directions and the ensemble
+        
+    Returns:
+        Dict with per-member 'distances' (K, n_steps), 'recovery_time',
+        'recovered', 'max_divergence', 'final_distance' and 'ftle' (K,),
+        the member 'directions' and 'magnitudes', 'ftle_mean', and a
+        'recovery_time_distribution' (histogram over 0..n_steps plus summary
+        statistics of the perturbed members; unrecovered members count as
+        n_steps, and the statistics are NaN if every magnitude is 0)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if directions is None:
+        directions = random_directions(n_directions, kernel.N, rng)
+    directions = np.asarray(directions, dtype=float)
+    directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+    magnitudes = np.atleast_1d(np.asarray(magnitudes, dtype=float))
+    
+    member_dirs = np.repeat(directions, len(magnitudes), axis=0)
+    member_mags = np.tile(magnitudes, len(directions))
+    K = len(member_mags)
+    
+    # Member 0 is the baseline
+    ensemble = KernelEnsemble.from_kernel(kernel, K + 1, rng=rng, common_random_numbers=True)
+    ensemble.S[1:] += member_mags[:, np.newaxis] * member_dirs
+    
+    distances = np.zeros((K, n_steps))
+    for t in range(n_steps):
+        ensemble.step()
+        distances[:, t] = np.linalg.norm(ensemble.S[1:] - ensemble.S[0], axis=1)
+        
+    below = distances < recovery_threshold
+    recovered = np.any(below, axis=1)
+    recovery_time = np.where(recovered, np.argmax(below, axis=1), n_steps)
+    # Unperturbed members (magnitude 0) have no exponent and are left out
+    # of the summary statistics
+    perturbed = member_mags > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ftle = np.where(
+            perturbed, np.log(np.maximum(distances[:, -1], 1e-12) / member_mags) / n_steps, np.nan
+        )
+    times = recovery_time[perturbed]
+    
+    if len(times):
+        summary = {
+            'recovered_fraction': float(np.mean(recovered[perturbed])),
+            'mean': float(np.mean(times)),
+            'median': float(np.median(times)),
+            'p5': float(np.percentile(times, 5)),
+            'p95': float(np.percentile(times, 95))
+        }
+    else:
+        summary = dict.fromkeys(('recovered_fraction', 'mean', 'median', 'p5', 'p95'), float('nan'))
+    
+    return {
+        'distances': distances,
+        'directions': member_dirs,
+        'magnitudes': member_mags,
+        'recovery_time': recovery_time,
+        'recovered': recovered,
+        'max_divergence': distances.max(axis=1),
+        'final_distance': distances[:, -1],
+        'ftle': ftle,
+        'ftle_mean': float(np.nanmean(ftle)) if len(times) else float('nan'),
+        'recovery_time_distribution': {
+            'counts': np.bincount(times, minlength=n_steps + 1),
+            **summary
+        }
+    }
@@ -1,47 +1,41 @@
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from ..core.lifecycle import RuleLifecycleTable, lifecycle_columns
+from .survival import top_k_indices
 
-def analyze_rule_lifecycles(rule_lifecycles: Dict[str, Dict]) -> Dict[str, Any]:
+def analyze_rule_lifecycles(rule_lifecycles: Union[RuleLifecycleTable, Dict[Any, Dict]]) -> Dict[str, Any]:
     """
     Analyzes rule lifecycle data to find patterns.
+
+    Accepts a RuleLifecycleTable (Kernel.get_stats()['rule_lifecycles'])
+    or a legacy uid -> {'birth_t', 'death_t', 'peak_strength'} mapping.
+    Lifespans cover dead rules only; for censoring-aware estimates see
+    analysis.survival.
     """
-    if not rule_lifecycles:
+    if len(rule_lifecycles) == 0:
         return {}
-        
-    lifespans = []
-    peak_strengths = []
-    deaths = 0
-    
-    for uid, data in rule_lifecycles.items():
-        birth = data['birth_t']
-        death = data['death_t']
-        peak = data['peak_strength']
-        
-        peak_strengths.append(peak)
-        
-        if death is not None:
-            lifespans.append(death - birth)
-            deaths += 1
-            
+
+    uids, birth, death, peak = lifecycle_columns(rule_lifecycles)
+    dead = death >= 0
+    lifespans = death[dead] - birth[dead]
+
     return {
-        'n_rules': len(rule_lifecycles),
-        'n_deaths': deaths,
-        'avg_lifespan': np.mean(lifespans) if lifespans else 0.0,
-        'max_lifespan': np.max(lifespans) if lifespans else 0.0,
-        'avg_peak_strength': np.mean(peak_strengths) if peak_strengths else 0.0,
-        'lifespans': lifespans,
-        'peak_strengths': peak_strengths
+        'n_rules': len(uids),
+        'n_deaths': int(np.sum(dead)),
+        'avg_lifespan': float(np.mean(lifespans)) if len(lifespans) else 0.0,
+        'max_lifespan': int(np.max(lifespans)) if len(lifespans) else 0.0,
+        'avg_peak_strength': float(np.mean(peak)),
+        'lifespans': lifespans.tolist(),
+        'peak_strengths': peak.tolist()
     }
 
-def identify_successful_rules(rule_lifecycles: Dict[str, Dict], top_n: int = 5) -> List[str]:
+def identify_successful_rules(rule_lifecycles: Union[RuleLifecycleTable, Dict[Any, Dict]], top_n: int = 5) -> List[Any]:
     """
     Identifies rules with the longest lifespans or highest peak strengths.
     """
-    scores = []
-    for uid, data in rule_lifecycles.items():
-        # Simple score: peak_strength * (lifespan if dead, or current_age if alive)
-        # For simplicity, just use peak_strength for now
-        scores.append((uid, data['peak_strength']))
-        
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return [x[0] for x in scores[:top_n]]
+    uids, birth, death, peak = lifecycle_columns(rule_lifecycles)
+    # Simple score: peak_strength * (lifespan if dead, or current_age if alive)
+    # For simplicity, just use peak_strength for now
+    # Partial selection; earlier-born rules come first on ties
+    order = top_k_indices(peak, top_n)
+    return [uids[i] for i in order]
@@ -0,0 +1,91 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from scipy import stats
+from ..experiments.parallel import run_tasks
+
+
+def mode_decided(classes: Sequence[str], confidence: float = 0.95) -> bool:
+    """
+    Whether the most frequent class is significantly ahead of the runner-up.
+
+    One-sided sign test on the runs that landed in either of the two
+    leading classes: the mode is decided when P(X >= leader | p = 1/2)
+    falls below 1 - confidence. Unanimous runs decide after
+    ceil(log2(1 / (1 - confidence))) replicates (5 at 95%).
+    """
+    ranked = Counter(classes).most_common(2)
+    if not ranked:
+        return False
+    leader = ranked[0][1]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    p_value = stats.binom.sf(leader - 1, leader + runner_up, 0.5)
+    return p_value < 1.0 - confidence
+
+
+def stable_fraction_decided(classes: Sequence[str], confidence: float = 0.95, threshold: float = 0.8) -> bool:
+    """
+    Whether the STABLE fraction is significantly above or below threshold.
+
+    The default threshold is the pass mark of compute_stability_report.
+    """
+    n = len(classes)
+    if n == 0:
+        return False
+    k = sum(1 for c in classes if c == 'STABLE')
+    alpha = 1.0 - confidence
+    above = stats.binom.sf(k - 1, n, threshold) < alpha
+    below = stats.binom.cdf(k, n, threshold) < alpha
+    return above or below
+
+
+def run_sequential(
+    fn: Callable[[Any], Any],
+    point_configs: List[Dict[str, Any]],
+    seeds: List[int],
+    decided: Callable[[List[str]], bool],
+    class_of: Callable[[Any], str],
+    min_runs: int = 3,
+    cache: Optional[Any] = None,
+    workers: Optional[int] = 1,
+    desc: str = "Sweep",
+    queue: Optional[Any] = None
+) -> Tuple[List[List[Any]], List[List[str]]]:
+    """
+    Adds replicates to each point only until its outcome is decided.
+
+    Every point first runs seeds[:min_runs]; afterwards each round gives
+    one more seed to every point that is still undecided, until len(seeds)
+    runs. Each round's runs go to the process pool together, so the budget
+    concentrates on ambiguous points. Point p always uses a prefix of
+    seeds, so a point that never decides reproduces a fixed-size sweep.
+
+    Args:
+        fn: Task function called with (config, seed, cache)
+        point_configs: One config per point
+        seeds: Seed sequence; its length caps the runs per point
+        decided: Stopping rule applied to a point's classes so far
+        class_of: Maps one fn result to its class label
+        queue: Optional JobQueue recording every round's runs
+
+    Returns:
+        (results, classes): per point, the fn results and their classes
+    """
+    results: List[List[Any]] = [[] for _ in point_configs]
+    classes: List[List[str]] = [[] for _ in point_configs]
+    active = list(range(len(point_configs)))
+    n_target = min(min_runs, len(seeds))
+
+    while active:
+        tasks, owners = [], []
+        for p in active:
+            for seed in seeds[len(results[p]):n_target]:
+                tasks.append((point_configs[p], seed, cache))
+                owners.append(p)
+        for p, result in zip(owners, run_tasks(fn, tasks, workers=workers, desc=desc, queue=queue)):
+            results[p].append(result)
+            classes[p].append(class_of(result))
+
+        active = [p for p in active if len(results[p]) < len(seeds) and not decided(classes[p])]
+        n_target += 1
+
+    return results, classes
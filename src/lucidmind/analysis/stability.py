@@ -1,6 +1,7 @@
 import numpy as np
-from typing import Dict, List, Tuple
-from ..metrics.explosion import check_explosion
+from typing import Dict, List, Optional, Tuple
+from ..metrics.explosion import check_explosion, detect_rule_saturation
+from ..metrics.online import RollingGrowthDetector, EntropyLockDetector, RunLengthCounter
 
 def classify_run(
     metrics: Dict, 
@@ -57,6 +58,75 @@ def classify_run(
         
     return "UNSTABLE"
 
+class OnlineClassifier:
+    """
+    Streaming counterpart of classify_run, updated in O(1) per step.
+
+    Tracks E1 (rolling regression over the last 50 complexity values), E2
+    (Welford mean/variance of entropy), the longest collapse run and the
+    in-range count; E3 comes from the kernel's born/died counters. At any
+    step, classify() gives the label classify_run would assign to the
+    history observed so far.
+    """
+    def __init__(
+        self,
+        c_min: int = 5,
+        c_max_abs: int = 32,
+        t_min_consecutive: int = 50,
+        stable_percentage: float = 0.9
+    ):
+        self.c_min = c_min
+        self.c_max_abs = c_max_abs
+        self.t_min_consecutive = t_min_consecutive
+        self.stable_percentage = stable_percentage
+        self.growth = RollingGrowthDetector()
+        self.entropy_lock = EntropyLockDetector()
+        self.collapse = RunLengthCounter()
+        self.n = 0
+        self.n_in_range = 0
+
+    def update(self, complexity: int, entropy: float):
+        self.growth.update(complexity)
+        self.entropy_lock.update(entropy)
+        self.collapse.update(complexity < self.c_min)
+        self.n_in_range += self.c_min <= complexity <= self.c_max_abs
+        self.n += 1
+
+    def update_many(self, complexity_history, entropy_history):
+        for c, e in zip(complexity_history, entropy_history):
+            self.update(c, e)
+
+    def exploded(self, damping_ratio: Optional[float] = None, born_total: int = 0) -> bool:
+        saturated = damping_ratio is not None and detect_rule_saturation(damping_ratio, born_total)
+        return self.growth.triggered or self.entropy_lock.triggered or saturated
+
+    def classify(self, damping_ratio: Optional[float] = None, born_total: int = 0) -> str:
+        """
+        Classifies the history so far (see classify_run).
+        
+        Returns:
+            One of: 'STABLE', 'EXPLOSION', 'COLLAPSE', 'UNSTABLE'
+        """
+        if self.exploded(damping_ratio, born_total):
+            return "EXPLOSION"
+        if self.n == 0:
+            return "UNSTABLE"
+        if self.collapse.longest >= self.t_min_consecutive:
+            return "COLLAPSE"
+            
+        healthy_damping = damping_ratio is None or 0.2 <= damping_ratio <= 0.95
+        if self.n_in_range / self.n >= self.stable_percentage and healthy_damping:
+            return "STABLE"
+        return "UNSTABLE"
+
+    def decided(self, damping_ratio: Optional[float] = None, born_total: int = 0) -> Optional[str]:
+        """
+        Returns 'COLLAPSE' or 'EXPLOSION' once the history so far is
+        classified as such, otherwise None.
+        """
+        label = self.classify(damping_ratio, born_total)
+        return label if label in ("COLLAPSE", "EXPLOSION") else None
+
 def find_stability_window(complexity_history: np.ndarray) -> Tuple[float, float]:
     """
     Identifies the complexity bounds [C_min_stable, C_max_stable] where the system operates.
@@ -76,11 +146,133 @@ def find_stability_window(complexity_history: np.ndarray) -> Tuple[float, float]
     
     return (float(c_min), float(c_max))
 
+def _batch_unbounded_growth(complexity: np.ndarray, min_window: int = 50) -> np.ndarray:
+    """
+    detect_unbounded_growth for every row of an (R, T) matrix at once.
+    
+    Uses the same centered least-squares formulas as scipy.stats.linregress.
+    """
+    R, T = complexity.shape
+    if T < min_window:
+        return np.zeros(R, dtype=bool)
+        
+    y = np.log(complexity[:, -min_window:].astype(float) + 1e-6)
+    x = np.arange(min_window, dtype=float)
+    xm = x - x.mean()
+    ym = y - y.mean(axis=1, keepdims=True)
+    ssxm = np.mean(xm * xm)
+    ssxym = np.mean(ym * xm, axis=1)
+    ssym = np.mean(ym * ym, axis=1)
+    
+    slope = ssxym / ssxm
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(ssym == 0.0, 0.0, ssxym / np.sqrt(ssxm * ssym))
+    r = np.clip(r, -1.0, 1.0)
+    return (slope > 0.1) & (r**2 > 0.9)
+
+def _max_run_length(mask: np.ndarray) -> np.ndarray:
+    """Longest run of consecutive True values in each row of a 2D boolean array."""
+    R, T = mask.shape
+    if T == 0:
+        return np.zeros(R, dtype=int)
+    idx = np.arange(T)
+    # Position of the most recent False at or before each step (-1 if none)
+    last_false = np.maximum.accumulate(np.where(mask, -1, idx), axis=1)
+    return np.max(idx - last_false, axis=1)
+
+def classify_runs(
+    complexity: np.ndarray,
+    entropy: Optional[np.ndarray] = None,
+    damping_ratios: Optional[np.ndarray] = None,
+    born_totals: Optional[np.ndarray] = None,
+    c_min: int = 5,
+    c_max_abs: int = 32,
+    t_min_consecutive: int = 50,
+    stable_percentage: float = 0.9
+) -> np.ndarray:
+    """
+    Vectorized classify_run for R runs of equal length.
+    
+    E4 needs perturbed trajectories and is not evaluated, as in classify_run
+    for metrics without them.
+    
+    Args:
+        complexity: (R, T) complexity histories
+        entropy: (R, T) entropy histories (None skips E2)
+        damping_ratios: (R,) final damping ratios; NaN or None means unknown
+        born_totals: (R,) rules born per run (defaults to 0)
+        
+    Returns:
+        (R,) array of 'STABLE', 'EXPLOSION', 'COLLAPSE' or 'UNSTABLE'
+    """
+    complexity = np.asarray(complexity)
+    R, T = complexity.shape
+    
+    # 1. Explosions (E1-E3)
+    explosion = _batch_unbounded_growth(complexity)
+    if entropy is not None and T >= 10:
+        entropy = np.asarray(entropy, dtype=float)
+        explosion |= (np.mean(entropy, axis=1) > 0.5) & (np.var(entropy, axis=1) < 0.01)
+        
+    if damping_ratios is None:
+        damping = np.full(R, np.nan)
+    else:
+        damping = np.array([np.nan if d is None else d for d in damping_ratios], dtype=float)
+    born = np.zeros(R, dtype=int) if born_totals is None else np.asarray(born_totals)
+    known = ~np.isnan(damping)
+    explosion |= known & (born >= 10) & (damping < 0.1)
+    
+    labels = np.full(R, "UNSTABLE", dtype=object)
+    if T > 0:
+        # 2. Collapse
+        collapse = _max_run_length(complexity < c_min) >= t_min_consecutive
+        
+        # 3. Stability
+        percentage = np.mean((complexity >= c_min) & (complexity <= c_max_abs), axis=1)
+        healthy_damping = ~known | ((damping >= 0.2) & (damping <= 0.95))
+        stable = (percentage >= stable_percentage) & healthy_damping
+        
+        labels[stable] = "STABLE"
+        labels[collapse] = "COLLAPSE"
+    labels[explosion] = "EXPLOSION"
+    return labels
+
+def find_stability_windows(complexity: np.ndarray) -> np.ndarray:
+    """
+    Vectorized find_stability_window for an (R, T) matrix of histories.
+    
+    Returns:
+        (R, 2) array of [C_min_stable, C_max_stable] per run
+    """
+    complexity = np.asarray(complexity)
+    R, T = complexity.shape
+    if T < 50:
+        return np.zeros((R, 2))
+    steady_state = complexity[:, int(T*0.1):]
+    return np.percentile(steady_state, [5, 95], axis=1).T.astype(float)
+
 def compute_stability_report(run_metrics_list: List[Dict]) -> Dict:
     """
     Aggregates stability statistics across multiple runs.
+    
+    Runs of equal length are classified in one classify_runs call;
+    otherwise each run is classified once with classify_run.
     """
-    classifications = [classify_run(m) for m in run_metrics_list]
+    lengths = {len(m['complexity_history']) for m in run_metrics_list}
+    batched = len(lengths) == 1 and all(
+        m.get('entropy_history') is not None and m.get('baseline_trajectory') is None
+        for m in run_metrics_list
+    )
+    if batched:
+        complexity = np.array([m['complexity_history'] for m in run_metrics_list])
+        classifications = classify_runs(
+            complexity,
+            np.array([m['entropy_history'] for m in run_metrics_list], dtype=float),
+            [m.get('damping_ratio') for m in run_metrics_list],
+            np.array([m.get('born_total', 0) for m in run_metrics_list])
+        ).tolist()
+    else:
+        classifications = [classify_run(m) for m in run_metrics_list]
     counts = {
         'STABLE': classifications.count('STABLE'),
         'EXPLOSION': classifications.count('EXPLOSION'),
@@ -91,8 +283,11 @@ def compute_stability_report(run_metrics_list: List[Dict]) -> Dict:
     total = len(classifications)
     percentages = {k: v / total for k, v in counts.items()}
     
-    windows = [find_stability_window(np.array(m['complexity_history'])) 
-               for m in run_metrics_list if classify_run(m) == 'STABLE']
+    stable = [i for i, c in enumerate(classifications) if c == 'STABLE']
+    if batched:
+        windows = [tuple(w) for w in find_stability_windows(complexity[stable]).tolist()] if stable else []
+    else:
+        windows = [find_stability_window(np.array(run_metrics_list[i]['complexity_history'])) for i in stable]
     
     if windows:
         avg_window_min = np.mean([w[0] for w in windows])
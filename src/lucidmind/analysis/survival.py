@@ -0,0 +1,247 @@
+import numpy as np
+from scipy import stats
+from typing import Dict, List, Any, Optional, Sequence, Union
+from ..core.lifecycle import RuleLifecycleTable, lifecycle_columns
+
+LifecycleSource = Union[RuleLifecycleTable, Dict[Any, Dict]]
+
+
+def pool_lifecycles(
+    tables: Sequence[LifecycleSource],
+    end_t: Optional[Union[int, Sequence[int]]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Pools the rule lifecycles of many runs into flat survival columns.
+
+    A rule that died has an observed lifespan death_t - birth_t; a rule
+    still alive at the end of its run is right-censored at end_t - birth_t.
+
+    Args:
+        tables: One RuleLifecycleTable (or legacy dict) per run
+        end_t: Final step of each run (or one value for all runs). Defaults
+               to the last birth or death recorded in each table, which
+               understates the exposure of rules alive at the end.
+
+    Returns:
+        Dict of equal-length arrays: 'run', 'uid' (object dtype if any legacy
+        dict has non-integer keys), 'birth_t', 'death_t' (-1 while alive), 'peak_strength', 'duration' and 'event' (True for
+        observed deaths, False for censored rules)
+    """
+    if end_t is not None and np.ndim(end_t) == 0:
+        end_t = [int(end_t)] * len(tables)
+
+    columns: Dict[str, List[np.ndarray]] = {k: [] for k in ('run', 'uid', 'birth_t', 'death_t', 'peak_strength')}
+    ends = []
+    for r, table in enumerate(tables):
+        if isinstance(table, RuleLifecycleTable):
+            uids, birth, death, peak = table.columns()
+        else:
+            # Legacy dicts may be keyed by strings such as 'rule_3'
+            keys, birth, death, peak = lifecycle_columns(table)
+            uids = np.empty(len(keys), dtype=object)
+            uids[:] = keys
+        columns['run'].append(np.full(len(birth), r, dtype=int))
+        columns['uid'].append(uids)
+        columns['birth_t'].append(birth)
+        columns['death_t'].append(death)
+        columns['peak_strength'].append(peak)
+        if end_t is not None:
+            end = int(end_t[r])
+        else:
+            end = int(max(birth.max(initial=0), death.max(initial=0)))
+        ends.append(np.full(len(birth), end, dtype=int))
+
+    pooled = {
+        k: np.concatenate(v) if v else np.zeros(0, dtype=float if k == 'peak_strength' else int)
+        for k, v in columns.items()
+    }
+    event = pooled['death_t'] >= 0
+    end = np.concatenate(ends) if ends else np.zeros(0, dtype=int)
+    pooled['event'] = event
+    pooled['duration'] = np.where(event, pooled['death_t'], end) - pooled['birth_t']
+    return pooled
+
+
+def kaplan_meier(durations: np.ndarray, events: np.ndarray, confidence: float = 0.95) -> Dict[str, Any]:
+    """
+    Kaplan-Meier survival curve of rule lifespans with right-censoring.
+
+    At each distinct event time t, S(t) = S(t-) * (1 - d_t / n_t) with d_t
+    deaths among the n_t rules still at risk (duration >= t). The
+    confidence band uses Greenwood's variance on the log(-log S) scale.
+
+    Args:
+        durations: Observed lifespan or censoring age of every rule
+        events: True where the rule died, False where it was censored
+        confidence: Coverage of the pointwise band
+
+    Returns:
+        Dict with 'time', 'survival', 'lower', 'upper', 'n_at_risk' and
+        'n_events' at the distinct event times, plus 'median' (first time
+        with S <= 0.5, None if never reached), 'n_rules' and 'n_censored'
+    """
+    durations = np.asarray(durations)
+    events = np.asarray(events, dtype=bool)
+    n = len(durations)
+    times, inverse, counts = np.unique(durations, return_inverse=True, return_counts=True)
+    deaths = np.bincount(inverse, weights=events, minlength=len(times)).astype(int)
+    # Rules with duration >= times[i]
+    at_risk = n - np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    keep = deaths > 0
+    times, deaths, at_risk = times[keep], deaths[keep], at_risk[keep]
+    survival = np.cumprod(1.0 - deaths / at_risk)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        greenwood = np.cumsum(deaths / (at_risk * (at_risk - deaths)))
+        log_s = np.log(survival)
+        z = stats.norm.ppf(0.5 + confidence / 2)
+        half = z * np.sqrt(greenwood) / np.abs(log_s)
+        lower = np.where(survival > 0, np.exp(-np.exp(np.log(-log_s) + half)), 0.0)
+        upper = np.where(survival > 0, np.exp(-np.exp(np.log(-log_s) - half)), 0.0)
+    # Before any drop the curve is exactly 1
+    lower = np.where(survival >= 1.0, 1.0, lower)
+    upper = np.where(survival >= 1.0, 1.0, upper)
+
+    below = np.flatnonzero(survival <= 0.5)
+    return {
+        'time': times,
+        'survival': survival,
+        'lower': lower,
+        'upper': upper,
+        'n_at_risk': at_risk,
+        'n_events': deaths,
+        'median': int(times[below[0]]) if len(below) else None,
+        'n_rules': n,
+        'n_censored': int(n - np.sum(events))
+    }
+
+
+def hazard_by_birth_time(
+    birth_t: np.ndarray,
+    durations: np.ndarray,
+    events: np.ndarray,
+    bins: Union[int, Sequence[float]] = 10
+) -> Dict[str, np.ndarray]:
+    """
+    Death hazard of rules grouped by when they were born.
+
+    Per birth-time bin the hazard is deaths / total exposure (rule-steps
+    lived, censored rules included), the maximum-likelihood rate of a
+    constant hazard within the group.
+
+    Args:
+        birth_t: Birth step of every rule
+        durations: Observed lifespan or censoring age of every rule
+        events: True where the rule died
+        bins: Number of equal-width bins or explicit bin edges
+
+    Returns:
+        Dict with 'edges' (n_bins + 1), and per bin 'n_rules', 'n_events',
+        'exposure', 'hazard' (NaN for empty bins) and 'mean_duration'
+    """
+    birth_t = np.asarray(birth_t)
+    durations = np.asarray(durations, dtype=float)
+    events = np.asarray(events, dtype=bool)
+    if np.ndim(bins) == 0:
+        lo, hi = (birth_t.min(), birth_t.max()) if len(birth_t) else (0, 1)
+        edges = np.linspace(lo, hi if hi > lo else lo + 1, int(bins) + 1)
+    else:
+        edges = np.asarray(bins, dtype=float)
+    n_bins = len(edges) - 1
+    # Bins are [edge_i, edge_i+1), the last one closed on the right
+    which = np.clip(np.searchsorted(edges, birth_t, side='right') - 1, 0, n_bins - 1)
+
+    n_rules = np.bincount(which, minlength=n_bins)
+    n_events = np.bincount(which, weights=events, minlength=n_bins).astype(int)
+    exposure = np.bincount(which, weights=durations, minlength=n_bins)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hazard = np.where(exposure > 0, n_events / exposure, np.nan)
+        mean_duration = np.where(n_rules > 0, exposure / n_rules, np.nan)
+    return {
+        'edges': edges,
+        'n_rules': n_rules,
+        'n_events': n_events,
+        'exposure': exposure,
+        'hazard': hazard,
+        'mean_duration': mean_duration
+    }
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first, in O(n + k log k).
+
+    Uses np.argpartition instead of a full sort. Ties are broken towards
+    the lower index, so the result equals np.argsort(-values,
+    kind='stable')[:k].
+    """
+    values = np.asarray(values)
+    n = len(values)
+    k = min(int(k), n)
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    if k < n:
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        above = np.flatnonzero(values > threshold)
+        # Lowest indices among the values tied at the threshold
+        tied = np.flatnonzero(values == threshold)[:k - len(above)]
+        selected = np.concatenate([above, tied])
+    else:
+        selected = np.arange(n)
+    return selected[np.lexsort((selected, -values[selected]))]
+
+
+def top_rules(pooled: Dict[str, np.ndarray], k: int = 5, by: str = 'peak_strength') -> Dict[str, np.ndarray]:
+    """
+    The k best rules of pooled lifecycles.
+
+    Args:
+        pooled: Output of pool_lifecycles
+        k: Number of rules
+        by: 'peak_strength' or 'lifespan' (observed duration, so long-lived
+            censored rules count with their age)
+
+    Returns:
+        pooled's columns restricted to the selected rules, best first
+    """
+    if by == 'peak_strength':
+        key = pooled['peak_strength']
+    elif by == 'lifespan':
+        key = pooled['duration']
+    else:
+        raise ValueError(f"Unknown ranking '{by}' (expected 'peak_strength' or 'lifespan')")
+    idx = top_k_indices(key, k)
+    return {name: column[idx] for name, column in pooled.items()}
+
+
+def analyze_survival(
+    tables: Sequence[LifecycleSource],
+    end_t: Optional[Union[int, Sequence[int]]] = None,
+    bins: Union[int, Sequence[float]] = 10,
+    top_k: int = 5
+) -> Dict[str, Any]:
+    """
+    Survival analysis of rule lifecycles pooled across runs.
+
+    Returns:
+        Dict with 'n_rules', 'n_deaths', 'n_censored', 'survival'
+        (kaplan_meier), 'hazard' (hazard_by_birth_time), 'top_by_peak' and
+        'top_by_lifespan' (top_rules), plus 'lifespans' of the rules that
+        died and 'peak_strengths' of all rules, as in
+        analyze_rule_lifecycles, so the result can be passed to
+        visualization.rules as is
+    """
+    pooled = pool_lifecycles(tables, end_t)
+    event = pooled['event']
+    return {
+        'n_rules': len(event),
+        'n_deaths': int(np.sum(event)),
+        'n_censored': int(np.sum(~event)),
+        'survival': kaplan_meier(pooled['duration'], event),
+        'hazard': hazard_by_birth_time(pooled['birth_t'], pooled['duration'], event, bins),
+        'top_by_peak': top_rules(pooled, top_k, 'peak_strength'),
+        'top_by_lifespan': top_rules(pooled, top_k, 'lifespan'),
+        'lifespans': pooled['duration'][event].tolist(),
+        'peak_strengths': pooled['peak_strength'].tolist()
+    }
@@ -1,49 +1,94 @@
 import numpy as np
 import json
 import os
-from typing import Dict, List, Any, Tuple
-from ..experiments.runner import ExperimentRunner
+from typing import Dict, List, Any, Tuple, Optional
+from ..experiments.runner import ExperimentRunner, run_metrics_task
+from ..experiments.parallel import derive_seeds, run_tasks
+from ..experiments.cache import ResultCache
+from ..experiments.queue import JobQueue
 from .stability import classify_run, compute_stability_report
+from .sequential import run_sequential, stable_fraction_decided
 
 class ParameterSweeper:
     """
     Framework for exploring the parameter space of the LucidMind kernel.
+    
+    With a JobQueue, runs are recorded in its database, so a restarted
+    sweep skips the runs an interrupted one already finished.
     """
-    def __init__(self, base_config: Dict[str, Any]):
+    def __init__(
+        self,
+        base_config: Dict[str, Any],
+        cache: Optional[ResultCache] = None,
+        queue: Optional[JobQueue] = None
+    ):
         self.base_config = base_config
+        self.cache = cache
+        self.queue = queue
 
     def sweep_1d(
         self, 
         param_name: str, 
         values: List[Any], 
         n_runs: int = 10,
-        T: int = 1000
+        T: int = 1000,
+        use_ensemble: bool = False,
+        workers: Optional[int] = 1,
+        max_runs: Optional[int] = None,
+        decision_confidence: float = 0.95
     ) -> Dict[str, Any]:
         """
         Runs a 1D sweep across a parameter and records stability stats.
+        
+        Every value uses the same n_runs seeds, derived from base seed 42.
+        With use_ensemble=True all values x n_runs seeds are simulated in one
+        lockstep KernelEnsemble; otherwise runs are spread over `workers`
+        processes.
+        
+        With max_runs set, replicates are sequential: each value starts with
+        n_runs seeds and gains one seed per round until its STABLE fraction
+        is decided against the report's pass mark at decision_confidence
+        (see sequential.stable_fraction_decided) or it reaches max_runs.
+        Each result records the runs it used as 'n_runs'.
         """
         results = []
+        seeds = derive_seeds(42, max(n_runs, max_runs or 0))
         
         print(f"Starting 1D sweep for {param_name} across {len(values)} values")
         
-        for val in values:
-            config = self.base_config.copy()
-            config[param_name] = val
-            config['T'] = T
-            
-            runner = ExperimentRunner(config)
-            run_metrics = []
-            for r in range(n_runs):
-                metrics = runner.run_metrics_only(seed=42+r)
-                run_metrics.append(metrics)
-                
+        config = self.base_config.copy()
+        config['T'] = T
+        runner = ExperimentRunner(config)
+        if max_runs is not None:
+            if use_ensemble:
+                raise ValueError("Sequential replicates (max_runs) do not support use_ensemble")
+            point_metrics, _ = run_sequential(
+                run_metrics_task, [{**config, param_name: val} for val in values], seeds,
+                decided=lambda c: stable_fraction_decided(c, decision_confidence),
+                class_of=classify_run,
+                min_runs=n_runs, cache=self.cache, workers=workers, queue=self.queue
+            )
+        elif use_ensemble:
+            overrides = [{param_name: val} for val in values for seed in seeds]
+            all_metrics = runner.run_metrics_ensemble(seeds * len(values), overrides)
+        else:
+            tasks = []
+            for val in values:
+                point_config = {**config, param_name: val}
+                tasks.extend((point_config, seed, self.cache) for seed in seeds)
+            all_metrics = run_tasks(run_metrics_task, tasks, workers=workers, desc="Sweep", queue=self.queue)
+        if max_runs is None:
+            point_metrics = [all_metrics[k * n_runs:(k + 1) * n_runs] for k in range(len(values))]
+        
+        for val, run_metrics in zip(values, point_metrics):
             report = compute_stability_report(run_metrics)
             results.append({
                 'value': val,
                 'stable_pct': report['percentages']['STABLE'],
                 'explosion_pct': report['percentages']['EXPLOSION'],
                 'collapse_pct': report['percentages']['COLLAPSE'],
-                'avg_window': report['avg_stability_window']
+                'avg_window': report['avg_stability_window'],
+                'n_runs': len(run_metrics)
             })
             
             print(f"  {param_name}={val}: stable={report['percentages']['STABLE']:.2f}")
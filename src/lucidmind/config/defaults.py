@@ -20,4 +20,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     # Gating parameters
     'gate_k': 3.0,
     'gate_T': 0.8,
+    
+    # Execution engine ('list' or 'bank'); does not change the dynamics
+    'rule_engine': 'list',
+    'reference_compatible': True,
 }
@@ -0,0 +1,323 @@
+import numpy as np
+from typing import List, Dict, Any, Optional
+from ..metrics.rules import compute_damping_ratio
+from .kernel import Kernel
+
+# Parameters that may differ between ensemble members
+MEMBER_PARAMS = {
+    'tau': 0.2,
+    'noise_sigma': 0.03,
+    'alpha': 0.05,
+    'beta': 0.03,
+    'death_threshold': -0.5,
+    'bad_steps_to_birth': 15,
+    'k_delta': 0.05,
+    'gate_k': 3.0,
+    'gate_T': 0.8,
+}
+
+# Parameters that fix array shapes and must be shared by all members
+SHARED_PARAMS = {
+    'N': 32,
+    'birth_window': 25,
+}
+
+
+class KernelEnsemble:
+    """
+    Lockstep ensemble of R independent LucidMind kernels.
+
+    States are held as an (R, N) array and the ragged per-member rule sets as
+    (R, capacity, ...) arrays with live slots packed at the front of each row,
+    so gating, selection, strength updates and birth checks for all members
+    are single vectorized operations. Each member carries its own dynamics
+    parameters (see MEMBER_PARAMS); N and birth_window must be shared.
+
+    All members draw from one Generator in batched calls, so a member is
+    statistically identical to a Kernel run with the same configuration but
+    does not reproduce the stream of an individually seeded Kernel.
+
+    With common_random_numbers=True every draw is made once per step and
+    shared by all members (gating uniforms per slot, the selection uniform
+    and the noise vector), so members differ only through their states,
+    rules and parameters. This is the setting for perturbation ensembles
+    (see from_kernel and analysis.recovery).
+
+    See: docs/math_core.md#4-transition-operator
+    """
+    def __init__(
+        self,
+        configs: List[Dict[str, Any]],
+        rng: Optional[np.random.Generator] = None,
+        capacity: int = 64,
+        common_random_numbers: bool = False
+    ):
+        if not configs:
+            raise ValueError("KernelEnsemble needs at least one member config")
+        self.configs = configs
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.R = len(configs)
+        self.common_random_numbers = common_random_numbers
+
+        for name, default in SHARED_PARAMS.items():
+            values = {c.get(name, default) for c in configs}
+            if len(values) > 1:
+                raise ValueError(f"Parameter '{name}' must be shared by all ensemble members, got {sorted(values)}")
+            setattr(self, name, values.pop())
+
+        for name, default in MEMBER_PARAMS.items():
+            setattr(self, name, np.array([float(c.get(name, default)) for c in configs]))
+
+        R, N = self.R, self.N
+        self.S = self.rng.normal(0, 0.1, size=(R, N))
+
+        # Rule banks: slots [0, n_rules[r]) of row r are live
+        capacity = max(int(capacity), 1)
+        self.W = np.zeros((R, capacity, N))
+        self.b = np.zeros((R, capacity))
+        self.delta = np.zeros((R, capacity, N))
+        self.strength = np.zeros((R, capacity))
+        self.peak = np.zeros((R, capacity))
+        self.n_rules = np.zeros(R, dtype=int)
+
+        # Shared-cursor ring of the last birth_window states; mem_len counts
+        # states recorded since each member's last birth
+        self.memory = np.zeros((R, self.birth_window, N))
+        self.memory_comp = np.zeros((R, self.birth_window))
+        self.mem_pos = 0
+        self.mem_len = np.zeros(R, dtype=int)
+
+        self.t = 0
+        self.born_total = np.zeros(R, dtype=int)
+        self.died_total = np.zeros(R, dtype=int)
+
+    @classmethod
+    def from_kernel(
+        cls,
+        kernel: Kernel,
+        R: int,
+        rng: Optional[np.random.Generator] = None,
+        common_random_numbers: bool = True
+    ) -> 'KernelEnsemble':
+        """
+        Clones a kernel's current state into R identical ensemble members.
+
+        Every member starts from the kernel's state, live rules (with their
+        strengths) and birth window. The clones then evolve under the
+        ensemble's own generator: they are statistically equivalent to
+        kernel.fork() copies but do not replay the kernel's stream.
+
+        Args:
+            kernel: Kernel to clone (left unchanged)
+            R: Number of members
+            rng: Generator of the ensemble; defaults to a fresh one
+            common_random_numbers: Share every draw between members
+        """
+        snap = kernel.snapshot()
+        n_rules = len(snap['rule_strength'])
+        ensemble = cls([kernel.config] * R, rng=rng, capacity=max(2 * n_rules, 64),
+                       common_random_numbers=common_random_numbers)
+        ensemble.t = kernel.t
+        ensemble.S = np.tile(snap['S'], (R, 1))
+
+        ensemble.W[:, :n_rules] = snap['rule_w']
+        ensemble.b[:, :n_rules] = snap['rule_b']
+        ensemble.delta[:, :n_rules] = snap['rule_delta']
+        ensemble.strength[:, :n_rules] = snap['rule_strength']
+        ensemble.peak[:, :n_rules] = snap['rule_strength']
+        ensemble.n_rules[:] = n_rules
+
+        # Chronological birth window at the front of the ring, cursor after it
+        n = len(snap['memory'])
+        ensemble.memory[:, :n] = snap['memory']
+        ensemble.memory_comp[:, :n] = snap['memory_comp']
+        ensemble.mem_pos = n % ensemble.birth_window
+        ensemble.mem_len[:] = n
+
+        ensemble.born_total[:] = kernel.born_total
+        ensemble.died_total[:] = kernel.died_total
+        return ensemble
+
+    @property
+    def capacity(self) -> int:
+        return self.W.shape[1]
+
+    def _live_mask(self) -> np.ndarray:
+        return np.arange(self.capacity)[np.newaxis, :] < self.n_rules[:, np.newaxis]
+
+    def _grow(self):
+        """Doubles the per-member slot capacity."""
+        cap = self.capacity
+        for name in ('W', 'delta'):
+            old = getattr(self, name)
+            new = np.zeros((self.R, 2 * cap, self.N))
+            new[:, :cap] = old
+            setattr(self, name, new)
+        for name in ('b', 'strength', 'peak'):
+            old = getattr(self, name)
+            new = np.zeros((self.R, 2 * cap))
+            new[:, :cap] = old
+            setattr(self, name, new)
+
+    def _remove(self, members: np.ndarray, slots: np.ndarray):
+        """Swap-removes one slot per listed member."""
+        last = self.n_rules[members] - 1
+        for arr in (self.W, self.b, self.delta, self.strength, self.peak):
+            arr[members, slots] = arr[members, last]
+        self.n_rules[members] = last
+
+    def _complexity(self, S: np.ndarray) -> np.ndarray:
+        """
+        Row-wise complexity with per-member tau.
+
+        See: docs/math_core.md#51-high-gradient-manifold-hgm
+        """
+        return np.sum(np.abs(S) > self.tau[:, np.newaxis], axis=1)
+
+    def _entropy(self, S: np.ndarray) -> np.ndarray:
+        """
+        Row-wise normalized entropy.
+
+        See: docs/math_core.md#52-entropy-and-distribution
+        """
+        A = np.abs(S)
+        p = A / (np.sum(A, axis=1, keepdims=True) + 1e-9)
+        return -np.sum(p * np.log(p + 1e-9), axis=1)
+
+    def step(self) -> Dict[str, np.ndarray]:
+        """Advances all members by one step and returns per-member (R,) arrays."""
+        self.t += 1
+        R = self.R
+        rows = np.arange(R)
+        live = self._live_mask()
+        # Shared draws are made for one member and broadcast over all
+        R_draw = 1 if self.common_random_numbers else R
+
+        # 1) Soft gating for every (member, slot) at once
+        np.maximum(self.peak, np.where(live, self.strength, -np.inf), out=self.peak)
+        g = np.einsum('rcn,rn->rc', self.W, self.S) + self.b
+        p = 1.0 / (1.0 + np.exp(-self.gate_k[:, np.newaxis] * g))
+        candidates = (self.rng.random((R_draw, self.capacity)) < p) & live
+        has_cand = np.any(candidates, axis=1)
+
+        # 2) Softmax selection over each member's candidates (inverse CDF)
+        logits = self.strength / np.maximum(self.gate_T, 1e-6)[:, np.newaxis]
+        logits = np.where(candidates, logits, -np.inf)
+        row_max = np.max(logits, axis=1, keepdims=True)
+        row_max[~has_cand] = 0.0
+        weights = np.where(candidates, np.exp(logits - row_max), 0.0)
+        cdf = np.cumsum(weights, axis=1)
+        u = self.rng.random(R_draw) * cdf[:, -1]
+        slot = np.minimum(np.sum(cdf <= u[:, np.newaxis], axis=1), self.capacity - 1)
+
+        # 3) Apply + noise
+        noise = self.rng.normal(0, 1, size=(R_draw, self.N)) * self.noise_sigma[:, np.newaxis]
+        S_new = self.S + np.where(has_cand[:, np.newaxis], self.delta[rows, slot], 0.0) + noise
+        comp_old = self._complexity(self.S)
+        comp_new = self._complexity(S_new)
+
+        # 4) Evaluate gain (members without candidates have zero gain)
+        gain = np.where(has_cand, comp_old - comp_new, 0)
+
+        # 5) Update strength of the applied rules
+        upd = np.where(gain > 0, self.alpha * gain, -self.beta * np.abs(gain))
+        applied = np.flatnonzero(has_cand)
+        self.strength[applied, slot[applied]] += upd[applied]
+
+        # 6) Death check
+        dying = applied[self.strength[applied, slot[applied]] < self.death_threshold[applied]]
+        if len(dying):
+            self._remove(dying, slot[dying])
+            self.died_total[dying] += 1
+
+        # 7) Update state and record it in the birth window
+        self.S = S_new
+        self.memory[:, self.mem_pos] = S_new
+        self.memory_comp[:, self.mem_pos] = comp_new
+        self.mem_pos = (self.mem_pos + 1) % self.birth_window
+        self.mem_len += 1
+
+        # 8) Rule birth
+        ready = np.flatnonzero(self.mem_len >= self.birth_window)
+        if len(ready):
+            recent_comp = self.memory_comp[ready]
+            median_comp = np.median(recent_comp, axis=1)
+            bad = np.sum(recent_comp >= median_comp[:, np.newaxis], axis=1)
+            born = ready[bad >= self.bad_steps_to_birth[ready]]
+            if len(born):
+                self._birth(born)
+
+        return {
+            'step': self.t,
+            'complexity': comp_new,
+            'entropy': self._entropy(self.S),
+            'n_rules': self.n_rules.copy(),
+            'gain': gain,
+            'born': self.born_total.copy(),
+            'died': self.died_total.copy()
+        }
+
+    def _birth(self, members: np.ndarray):
+        """
+        Synthesizes one rule per listed member from its birth window.
+
+        Vectorized counterpart of Kernel.synthesize_rule_from_memory.
+        """
+        while np.any(self.n_rules[members] >= self.capacity):
+            self._grow()
+
+        S_bar = np.mean(self.memory[members], axis=1)
+        norm = np.linalg.norm(S_bar, axis=1, keepdims=True) + 1e-9
+        active = np.abs(S_bar) > self.tau[members, np.newaxis]
+        delta = np.where(active, -self.k_delta[members, np.newaxis] * np.sign(S_bar), 0.0)
+
+        slots = self.n_rules[members]
+        self.W[members, slots] = S_bar / norm
+        self.b[members, slots] = 0.0
+        self.delta[members, slots] = delta
+        self.strength[members, slots] = 0.0
+        self.peak[members, slots] = 0.0
+        self.n_rules[members] += 1
+        self.born_total[members] += 1
+        self.mem_len[members] = 0
+
+    def run_metrics(self, T: int) -> List[Dict[str, Any]]:
+        """
+        Runs T lockstep steps and returns one metrics dict per member.
+
+        The dicts have the same layout as ExperimentRunner.run_metrics_only.
+        """
+        comp_hist = np.zeros((self.R, T), dtype=int)
+        ent_hist = np.zeros((self.R, T))
+        for t in range(T):
+            res = self.step()
+            comp_hist[:, t] = res['complexity']
+            ent_hist[:, t] = res['entropy']
+
+        stats = self.get_stats()
+        return [
+            {
+                'complexity_history': comp_hist[r].tolist(),
+                'entropy_history': ent_hist[r].tolist(),
+                'damping_ratio': stats[r]['damping_ratio'],
+                'born_total': stats[r]['born_total'],
+                'alive_count': stats[r]['alive_count']
+            }
+            for r in range(self.R)
+        ]
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Returns per-member lifecycle statistics.
+
+        See: docs/math_core.md#6-lifecycle-and-damping
+        """
+        return [
+            {
+                'born_total': int(self.born_total[r]),
+                'died_total': int(self.died_total[r]),
+                'alive_count': int(self.n_rules[r]),
+                'damping_ratio': compute_damping_ratio(int(self.died_total[r]), int(self.born_total[r]))
+            }
+            for r in range(self.R)
+        ]
@@ -1,9 +1,21 @@
+import copy
+import json
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from .rule import Rule, choose_weighted
+from .rule_bank import RuleBank
+from .lifecycle import RuleLifecycleTable
+from .profiling import KernelProfiler
 from .state import complexity, entropy
 from ..metrics.rules import compute_damping_ratio
 
+# Version of the kernel dynamics; bump whenever results of a seeded run
+# change (invalidates cached results)
+KERNEL_VERSION = 1
+
+# Layout version of Kernel.snapshot() / checkpoint files
+CHECKPOINT_VERSION = 2
+
 class Kernel:
     """
     LucidMind Core Kernel Dynamics.
@@ -31,18 +43,38 @@ class Kernel:
         self.gate_k = config.get('gate_k', 3.0)
         self.gate_T = config.get('gate_T', 0.8)
         
+        # Execution engine: 'list' (reference) or 'bank' (array-backed RuleBank)
+        self.rule_engine = config.get('rule_engine', 'list')
+        self.reference_compatible = config.get('reference_compatible', True)
+        if self.rule_engine not in ('list', 'bank'):
+            raise ValueError(f"Unknown rule_engine: {self.rule_engine}")
+        
         self.S = self.rng.normal(0, 0.1, size=self.N)
-        self.rules: List[Rule] = []
-        self.memory: List[np.ndarray] = []
+        if self.rule_engine == 'bank':
+            self.rules = RuleBank(self.N, reference_compatible=self.reference_compatible)
+        else:
+            self.rules: List[Rule] = []
+        
+        # Birth window: ring buffer of the last birth_window states recorded
+        # since the last birth, with their complexities and a histogram of
+        # those complexities for the rolling median
+        self.memory = np.zeros((self.birth_window, self.N))
+        self.memory_comp = np.zeros(self.birth_window, dtype=int)
+        self.memory_len = 0
+        self._mem_pos = 0
+        self._comp_counts = np.zeros(self.N + 1, dtype=int)
         
         # Statistics & Lifecycle Tracking
         self.t = 0
         self.rule_counter = 0
         self.born_total = 0
         self.died_total = 0
-        self.rule_lifecycles = {} # uid -> dict
+        self.rule_lifecycles = RuleLifecycleTable()
+        
+        # Optional per-phase timing (see core/profiling.py)
+        self.profiler = KernelProfiler() if config.get('profile', False) else None
 
-    def synthesize_rule_from_memory(self, memory_slice: List[np.ndarray]) -> Rule:
+    def synthesize_rule_from_memory(self, memory_slice: Union[List[np.ndarray], np.ndarray]) -> Rule:
         """Creates a new rule based on recent state history."""
         M = np.stack(memory_slice, axis=0)
         S_bar = np.mean(M, axis=0)
@@ -55,26 +87,130 @@ class Kernel:
         active = np.abs(S_bar) > self.tau
         delta[active] = -self.k_delta * np.sign(S_bar[active])
 
-        uid = f"rule_{self.rule_counter}"
+        uid = self.rule_counter
         self.rule_counter += 1
         return Rule(w=w, b=b, delta=delta, strength=0.0, uid=uid)
 
     def step(self) -> Dict[str, Any]:
         """Performs a single simulation step."""
+        S_comp, gain, _, applied_rule = self._advance(keep_rule=True)
+        prof = self.profiler
+        if prof is not None:
+            lap = prof.now()
+        
+        result = {
+            'step': self.t,
+            'state': self.S.copy(),
+            'complexity': S_comp,
+            'entropy': entropy(self.S),
+            'n_rules': len(self.rules),
+            'applied_rule': applied_rule,
+            'gain': gain,
+            'born': self.born_total,
+            'died': self.died_total
+        }
+        if prof is not None:
+            prof.lap('record', lap)
+        return result
+
+    def run(self, T: int, out: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Performs T steps, writing per-step values straight into arrays.
+        
+        This is the allocation-free counterpart of calling step() T times:
+        no per-step dicts are built and the state is only copied if a
+        'state' buffer is supplied.
+        
+        Args:
+            T: Number of steps
+            out: Buffers of length >= T keyed by any of 'complexity', 'entropy',
+                 'n_rules', 'gain', 'born', 'died', 'rule_strength' (NaN when
+                 no rule was applied) and 'state' (shape (T, N)). Keys that
+                 are absent are not computed. Defaults to freshly allocated
+                 'complexity', 'entropy', 'n_rules' and 'gain' arrays.
+                 
+        Returns:
+            The dict of buffers that was written
+        """
+        if out is None:
+            out = {
+                'complexity': np.zeros(T, dtype=int),
+                'entropy': np.zeros(T),
+                'n_rules': np.zeros(T, dtype=int),
+                'gain': np.zeros(T, dtype=int)
+            }
+        comp_out = out.get('complexity')
+        ent_out = out.get('entropy')
+        rules_out = out.get('n_rules')
+        gain_out = out.get('gain')
+        born_out = out.get('born')
+        died_out = out.get('died')
+        strength_out = out.get('rule_strength')
+        state_out = out.get('state')
+        prof = self.profiler
+        
+        for i in range(T):
+            S_comp, gain, strength, _ = self._advance(keep_rule=False)
+            if prof is not None:
+                lap = prof.now()
+            
+            if comp_out is not None:
+                comp_out[i] = S_comp
+            if ent_out is not None:
+                ent_out[i] = entropy(self.S)
+            if rules_out is not None:
+                rules_out[i] = len(self.rules)
+            if gain_out is not None:
+                gain_out[i] = gain
+            if born_out is not None:
+                born_out[i] = self.born_total
+            if died_out is not None:
+                died_out[i] = self.died_total
+            if strength_out is not None:
+                strength_out[i] = np.nan if strength is None else strength
+            if state_out is not None:
+                state_out[i] = self.S
+            if prof is not None:
+                prof.lap('record', lap)
+                
+        return out
+
+    def _advance(self, keep_rule: bool = True) -> Tuple[int, int, Optional[float], Optional[Rule]]:
+        """
+        Applies one transition of the kernel dynamics.
+        
+        See: docs/math_core.md#4-transition-operator
+        
+        Args:
+            keep_rule: Whether to return the applied Rule (the bank engine
+                       has to build a snapshot object for it)
+                       
+        Returns:
+            (complexity of the new state, gain, strength of the applied rule
+            after its update or None, applied Rule or None)
+        """
+        if self.rule_engine == 'bank':
+            return self._advance_bank(keep_rule)
+        
         self.t += 1
+        prof = self.profiler
+        if prof is not None:
+            lap = prof.now()
         # 1) Soft gating
         candidates = []
         for r in self.rules:
-            # Update peak strength tracking
-            if r.uid in self.rule_lifecycles:
-                self.rule_lifecycles[r.uid]['peak_strength'] = max(
-                    self.rule_lifecycles[r.uid]['peak_strength'], 
-                    r.strength
-                )
-                
             p = r.gate_prob(self.S, self.gate_k)
             if self.rng.random() < p:
                 candidates.append(r)
+        # Update peak strength tracking
+        self.rule_lifecycles.update_peaks(
+            [r.uid for r in self.rules], [r.strength for r in self.rules]
+        )
+        if prof is not None:
+            lap = prof.lap('gating', lap)
+            prof.counts['steps'] += 1
+            prof.counts['rules_scanned'] += len(self.rules)
+            prof.counts['candidates'] += len(candidates)
 
         applied_rule = None
         gain = 0
@@ -82,15 +218,21 @@ class Kernel:
         if not candidates:
             # Only noise and accumulation
             self.S = self.S + self.rng.normal(0, self.noise_sigma, size=self.N)
-            self.memory.append(self.S.copy())
+            S_comp = complexity(self.S, self.tau)
+            if prof is not None:
+                lap = prof.lap('apply', lap)
         else:
             # 2) Choose rule
             applied_rule = choose_weighted(candidates, self.gate_T, rng=self.rng)
+            if prof is not None:
+                lap = prof.lap('selection', lap)
 
             # 3) Apply + noise
             S_old_comp = complexity(self.S, self.tau)
             S_new = applied_rule.apply(self.S) + self.rng.normal(0, self.noise_sigma, size=self.N)
             S_new_comp = complexity(S_new, self.tau)
+            if prof is not None:
+                lap = prof.lap('apply', lap)
 
             # 4) Evaluate gain
             gain = S_old_comp - S_new_comp
@@ -100,48 +242,185 @@ class Kernel:
                 applied_rule.strength += self.alpha * gain
             else:
                 applied_rule.strength -= self.beta * abs(gain)
+            if prof is not None:
+                lap = prof.lap('strength', lap)
 
             # 6) Death check
             if applied_rule.strength < self.death_threshold:
                 self.rules.remove(applied_rule)
                 self.died_total += 1
-                if applied_rule.uid in self.rule_lifecycles:
-                    self.rule_lifecycles[applied_rule.uid]['death_t'] = self.t
+                self.rule_lifecycles.mark_death(applied_rule.uid, self.t)
+                if prof is not None:
+                    prof.counts['deaths'] += 1
+            if prof is not None:
+                lap = prof.lap('death', lap)
 
             # 7) Update state
             self.S = S_new
-            self.memory.append(self.S.copy())
+            S_comp = S_new_comp
+        self._remember(S_comp)
 
         # 8) Rule birth
-        if len(self.memory) >= self.birth_window:
-            recent = self.memory[-self.birth_window:]
-            recent_comp = [complexity(x, self.tau) for x in recent]
-            
-            median_comp = np.median(recent_comp)
-            bad = sum(1 for c in recent_comp if c >= median_comp)
-
-            if bad >= self.bad_steps_to_birth:
-                new_rule = self.synthesize_rule_from_memory(recent)
-                self.rules.append(new_rule)
-                self.born_total += 1
-                self.rule_lifecycles[new_rule.uid] = {
-                    'birth_t': self.t,
-                    'death_t': None,
-                    'peak_strength': 0.0
-                }
-                self.memory.clear()
+        new_rule = self._birth_check()
+        if new_rule is not None:
+            self.rules.append(new_rule)
+        if prof is not None:
+            prof.lap('birth', lap)
+            prof.counts['births'] += new_rule is not None
 
-        return {
-            'step': self.t,
-            'state': self.S.copy(),
-            'complexity': complexity(self.S, self.tau),
-            'entropy': entropy(self.S),
-            'n_rules': len(self.rules),
-            'applied_rule': applied_rule,
-            'gain': gain,
-            'born': self.born_total,
-            'died': self.died_total
-        }
+        strength = applied_rule.strength if applied_rule is not None else None
+        return S_comp, gain, strength, applied_rule
+
+    def _advance_bank(self, keep_rule: bool) -> Tuple[int, int, Optional[float], Optional[Rule]]:
+        """
+        Applies one transition on the array-backed RuleBank.
+        
+        Mirrors _advance() operation for operation; only rule storage differs.
+        """
+        self.t += 1
+        prof = self.profiler
+        if prof is not None:
+            lap = prof.now()
+        bank = self.rules
+        # 1) Soft gating (peak tracking + one matvec + one batched draw)
+        self.rule_lifecycles.update_peaks(bank.uid[:len(bank)], bank.strength[:len(bank)])
+        candidates = bank.gate(self.S, self.gate_k, self.rng)
+        if prof is not None:
+            lap = prof.lap('gating', lap)
+            prof.counts['steps'] += 1
+            prof.counts['rules_scanned'] += len(bank)
+            prof.counts['candidates'] += len(candidates)
+
+        applied_rule = None
+        strength = None
+        gain = 0
+        
+        if len(candidates) == 0:
+            # Only noise and accumulation
+            self.S = self.S + self.rng.normal(0, self.noise_sigma, size=self.N)
+            S_comp = complexity(self.S, self.tau)
+            if prof is not None:
+                lap = prof.lap('apply', lap)
+        else:
+            # 2) Choose rule
+            slot = bank.choose(candidates, self.gate_T, self.rng)
+            if prof is not None:
+                lap = prof.lap('selection', lap)
+
+            # 3) Apply + noise
+            S_old_comp = complexity(self.S, self.tau)
+            S_new = (self.S + bank.delta[slot]) + self.rng.normal(0, self.noise_sigma, size=self.N)
+            S_new_comp = complexity(S_new, self.tau)
+            if prof is not None:
+                lap = prof.lap('apply', lap)
+
+            # 4) Evaluate gain
+            gain = S_old_comp - S_new_comp
+
+            # 5) Update strength
+            if gain > 0:
+                bank.strength[slot] += self.alpha * gain
+            else:
+                bank.strength[slot] -= self.beta * abs(gain)
+            strength = float(bank.strength[slot])
+            if keep_rule:
+                applied_rule = bank.rule(slot)
+            if prof is not None:
+                lap = prof.lap('strength', lap)
+
+            # 6) Death check
+            if strength < self.death_threshold:
+                self.rule_lifecycles.mark_death(int(bank.uid[slot]), self.t)
+                bank.remove(slot)
+                self.died_total += 1
+                if prof is not None:
+                    prof.counts['deaths'] += 1
+            if prof is not None:
+                lap = prof.lap('death', lap)
+
+            # 7) Update state
+            self.S = S_new
+            S_comp = S_new_comp
+        self._remember(S_comp)
+
+        # 8) Rule birth
+        new_rule = self._birth_check()
+        if new_rule is not None:
+            bank.add(new_rule)
+        if prof is not None:
+            prof.lap('birth', lap)
+            prof.counts['births'] += new_rule is not None
+
+        return S_comp, gain, strength, applied_rule
+
+    def _remember(self, S_comp: int):
+        """Records the current state and its complexity in the birth window."""
+        pos = self._mem_pos
+        if self.memory_len >= self.birth_window:
+            # Slot holds the oldest state of a full window: drop it from the histogram
+            self._comp_counts[self.memory_comp[pos]] -= 1
+        else:
+            self.memory_len += 1
+        self.memory[pos] = self.S
+        self.memory_comp[pos] = S_comp
+        self._comp_counts[S_comp] += 1
+        self._mem_pos = (pos + 1) % self.birth_window
+
+    def _clear_memory(self):
+        """Empties the birth window (the ring contents are simply overwritten later)."""
+        self.memory_len = 0
+        self._comp_counts[:] = 0
+
+    def _recent_index(self) -> np.ndarray:
+        """Ring positions of the states recorded since the last birth, oldest first."""
+        n = self.memory_len
+        return (self._mem_pos - n + np.arange(n)) % self.birth_window
+
+    def recent_memory(self) -> np.ndarray:
+        """Returns the states recorded since the last birth, oldest first."""
+        return self.memory[self._recent_index()]
+
+    def _restore_memory(self, states: np.ndarray, comps: np.ndarray):
+        """Refills the birth window with chronologically ordered states."""
+        n = len(states)
+        self.memory[:n] = states
+        self.memory_comp[:n] = comps
+        self.memory_len = n
+        self._mem_pos = n % self.birth_window
+        self._comp_counts = np.bincount(self.memory_comp[:n], minlength=self.N + 1)
+
+    def _birth_check(self) -> Optional[Rule]:
+        """
+        Synthesizes a new rule if the full birth window is mostly 'bad'.
+        
+        A state is bad when its complexity is at or above the window median.
+        The median and the bad count come from the complexity histogram in
+        O(N) per step instead of recomputing complexity over the window; the
+        rule itself is synthesized from the window in chronological order,
+        so births are identical to the list-based reference.
+        
+        Returns:
+            The newborn Rule (already registered in the lifecycle table), or None
+        """
+        W = self.birth_window
+        if self.memory_len < W:
+            return None
+            
+        cum = np.cumsum(self._comp_counts)
+        lo = int(np.searchsorted(cum, (W - 1) // 2 + 1))
+        hi = int(np.searchsorted(cum, W // 2 + 1))
+        # c >= (lo + hi) / 2  <=>  c >= ceil((lo + hi) / 2) for integer c
+        first_bad = (lo + hi + 1) // 2
+        bad = W - (int(cum[first_bad - 1]) if first_bad > 0 else 0)
+        
+        if bad < self.bad_steps_to_birth:
+            return None
+            
+        new_rule = self.synthesize_rule_from_memory(self.recent_memory())
+        self.born_total += 1
+        self.rule_lifecycles.add(new_rule.uid, self.t)
+        self._clear_memory()
+        return new_rule
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -158,5 +437,146 @@ class Kernel:
             'died_total': died,
             'alive_count': len(self.rules),
             'damping_ratio': damping,
-            'rule_lifecycles': self.rule_lifecycles
+            'rule_lifecycles': self.rule_lifecycles,
+            'profile': self.profiler.summary() if self.profiler is not None else None
         }
+
+    def fork(self, rng: Optional[np.random.Generator] = None) -> 'Kernel':
+        """
+        Returns an independent copy of the kernel for branching experiments.
+        
+        Unlike copy.deepcopy, rule geometry (w, b, delta) is shared with the
+        original: list rules are shallow-copied and a RuleBank shares its
+        arrays copy-on-write. Only the state, the birth window, strengths
+        and the lifecycle columns are copied.
+        
+        Args:
+            rng: Generator for the fork. Defaults to a copy of the current
+                 generator, so the fork replays the same random stream.
+        """
+        clone = copy.copy(self)
+        if rng is None:
+            bit_generator = type(self.rng.bit_generator)()
+            bit_generator.state = self.rng.bit_generator.state
+            rng = np.random.Generator(bit_generator)
+        clone.rng = rng
+        
+        clone.S = self.S.copy()
+        clone.memory = self.memory.copy()
+        clone.memory_comp = self.memory_comp.copy()
+        clone._comp_counts = self._comp_counts.copy()
+        
+        if self.rule_engine == 'bank':
+            clone.rules = self.rules.fork()
+        else:
+            clone.rules = [copy.copy(r) for r in self.rules]
+        clone.rule_lifecycles = self.rule_lifecycles.copy()
+        if self.profiler is not None:
+            clone.profiler = KernelProfiler()
+        return clone
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        Captures the complete kernel state as a flat dict of arrays.
+        
+        The snapshot holds the state, the birth window, the live rule arrays,
+        the counters, the lifecycle table and the bit-generator state, so a
+        kernel restored with from_snapshot() continues bit-identically.
+        """
+        if self.rule_engine == 'bank':
+            bank = self.rules
+            n = len(bank)
+            rule_w, rule_b = bank.w[:n].copy(), bank.b[:n].copy()
+            rule_delta, rule_strength = bank.delta[:n].copy(), bank.strength[:n].copy()
+            rule_uids = bank.uid[:n].copy()
+        else:
+            rule_w = np.array([r.w for r in self.rules]).reshape(len(self.rules), self.N)
+            rule_b = np.array([r.b for r in self.rules], dtype=float)
+            rule_delta = np.array([r.delta for r in self.rules]).reshape(len(self.rules), self.N)
+            rule_strength = np.array([r.strength for r in self.rules], dtype=float)
+            rule_uids = np.array([r.uid for r in self.rules], dtype=int)
+            
+        lifecycle_uids, birth_t, death_t, peak = self.rule_lifecycles.columns()
+        return {
+            'version': np.array(CHECKPOINT_VERSION),
+            'config': np.array(json.dumps(self.config, default=_json_default)),
+            'rng_state': np.array(json.dumps(self.rng.bit_generator.state)),
+            'counters': np.array([self.t, self.rule_counter, self.born_total, self.died_total]),
+            'S': self.S.copy(),
+            'memory': self.recent_memory(),
+            'memory_comp': self.memory_comp[self._recent_index()],
+            'rule_w': rule_w,
+            'rule_b': rule_b,
+            'rule_delta': rule_delta,
+            'rule_strength': rule_strength,
+            'rule_uids': rule_uids,
+            'lifecycle_uids': lifecycle_uids,
+            'lifecycle_birth_t': birth_t,
+            'lifecycle_death_t': death_t,
+            'lifecycle_peak': peak,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snap: Dict[str, np.ndarray], config: Optional[Dict[str, Any]] = None) -> 'Kernel':
+        """
+        Rebuilds a kernel from snapshot() output.
+        
+        Args:
+            snap: Snapshot arrays (e.g. an opened checkpoint file)
+            config: Config override; defaults to the config stored in the
+                    snapshot. Only execution options such as rule_engine
+                    should differ, or the continuation is not a replay.
+        """
+        version = int(snap['version'])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+            
+        if config is None:
+            config = json.loads(str(snap['config']))
+        state = json.loads(str(snap['rng_state']))
+        bit_generator = getattr(np.random, state['bit_generator'])()
+        bit_generator.state = state
+        
+        kernel = cls(config, rng=np.random.Generator(bit_generator))
+        # The constructor drew an initial state from the generator: restore it afterwards
+        kernel.rng.bit_generator.state = state
+        kernel.t, kernel.rule_counter, kernel.born_total, kernel.died_total = (
+            int(x) for x in snap['counters']
+        )
+        kernel.S = np.array(snap['S'], dtype=float)
+        kernel._restore_memory(snap['memory'], snap['memory_comp'])
+        
+        uids = np.asarray(snap['lifecycle_uids'], dtype=int)
+        table = kernel.rule_lifecycles
+        for uid, birth in zip(uids, snap['lifecycle_birth_t']):
+            table.add(int(uid), int(birth))
+        table.death_t[uids] = snap['lifecycle_death_t']
+        table.peak_strength[uids] = snap['lifecycle_peak']
+        
+        for w, b, delta, strength, uid in zip(
+            snap['rule_w'], snap['rule_b'], snap['rule_delta'],
+            snap['rule_strength'], snap['rule_uids']
+        ):
+            rule = Rule(w=w, b=b, delta=delta, strength=strength, uid=uid)
+            if kernel.rule_engine == 'bank':
+                kernel.rules.add(rule)
+            else:
+                kernel.rules.append(rule)
+        return kernel
+
+    def save_checkpoint(self, path: str):
+        """Writes snapshot() to a compressed .npz checkpoint file."""
+        np.savez_compressed(path, **self.snapshot())
+
+    @classmethod
+    def load_checkpoint(cls, path: str, config: Optional[Dict[str, Any]] = None) -> 'Kernel':
+        """Restores a kernel written by save_checkpoint()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_snapshot({k: data[k] for k in data.files}, config=config)
+
+
+def _json_default(obj):
+    """Serializes NumPy scalars found in configs (e.g. values from np.linspace)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,111 @@
+import numpy as np
+from typing import Dict, Any, List, Tuple, Union
+
+
+class RuleLifecycleTable:
+    """
+    Columnar record of every rule born in a Kernel.
+
+    Row ``uid`` holds the birth step, death step (-1 while alive) and peak
+    strength of the rule with integer uid ``uid``. Columns grow by doubling,
+    and peak tracking for all live rules is one vectorized np.maximum.
+
+    See: docs/math_core.md#6-lifecycle-and-damping
+    """
+    def __init__(self, capacity: int = 256):
+        capacity = max(int(capacity), 1)
+        self.birth_t = np.full(capacity, -1, dtype=int)
+        self.death_t = np.full(capacity, -1, dtype=int)
+        self.peak_strength = np.zeros(capacity)
+        # Rows [0, n_rows) are in use; rows with birth_t == -1 are unregistered uids
+        self.n_rows = 0
+        self.n_registered = 0
+
+    def __len__(self) -> int:
+        return self.n_registered
+
+    def __contains__(self, uid: int) -> bool:
+        return 0 <= uid < self.n_rows and self.birth_t[uid] >= 0
+
+    def _grow(self, min_capacity: int):
+        capacity = len(self.birth_t)
+        while capacity < min_capacity:
+            capacity *= 2
+        for name, fill in (('birth_t', -1), ('death_t', -1), ('peak_strength', 0.0)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self.n_rows] = old[:self.n_rows]
+            setattr(self, name, new)
+
+    def add(self, uid: int, birth_t: int):
+        """Registers a newborn rule."""
+        if uid >= len(self.birth_t):
+            self._grow(uid + 1)
+        if self.birth_t[uid] < 0:
+            self.n_registered += 1
+        self.birth_t[uid] = birth_t
+        self.death_t[uid] = -1
+        self.peak_strength[uid] = 0.0
+        self.n_rows = max(self.n_rows, uid + 1)
+
+    def mark_death(self, uid: int, t: int):
+        """Records the death step of a registered rule."""
+        if uid in self:
+            self.death_t[uid] = t
+
+    def update_peaks(self, uids: Union[np.ndarray, List[int]], strengths: Union[np.ndarray, List[float]]):
+        """Raises the peak strength of the given (distinct, registered) uids."""
+        uids = np.asarray(uids, dtype=int)
+        if len(uids):
+            self.peak_strength[uids] = np.maximum(self.peak_strength[uids], strengths)
+
+    @property
+    def uids(self) -> np.ndarray:
+        """Registered uids in birth order."""
+        return np.flatnonzero(self.birth_t[:self.n_rows] >= 0)
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns (uids, birth_t, death_t, peak_strength) of registered rules."""
+        uids = self.uids
+        return uids, self.birth_t[uids], self.death_t[uids], self.peak_strength[uids]
+
+    def copy(self) -> 'RuleLifecycleTable':
+        clone = RuleLifecycleTable.__new__(RuleLifecycleTable)
+        clone.birth_t = self.birth_t.copy()
+        clone.death_t = self.death_t.copy()
+        clone.peak_strength = self.peak_strength.copy()
+        clone.n_rows = self.n_rows
+        clone.n_registered = self.n_registered
+        return clone
+
+    def to_dict(self) -> Dict[int, Dict[str, Any]]:
+        """Legacy dict-of-dicts view (uid -> birth_t, death_t or None, peak_strength)."""
+        uids, birth, death, peak = self.columns()
+        return {
+            int(u): {
+                'birth_t': int(b),
+                'death_t': None if d < 0 else int(d),
+                'peak_strength': float(p)
+            }
+            for u, b, d, p in zip(uids, birth, death, peak)
+        }
+
+
+def lifecycle_columns(
+    rule_lifecycles: Union[RuleLifecycleTable, Dict[Any, Dict]]
+) -> Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Normalizes a lifecycle table or a legacy uid -> dict mapping to columns.
+
+    Returns:
+        (uids, birth_t, death_t with -1 for alive rules, peak_strength)
+    """
+    if isinstance(rule_lifecycles, RuleLifecycleTable):
+        uids, birth, death, peak = rule_lifecycles.columns()
+        return uids.tolist(), birth, death, peak
+
+    values = list(rule_lifecycles.values())
+    birth = np.array([d['birth_t'] for d in values], dtype=int)
+    death = np.array([-1 if d['death_t'] is None else d['death_t'] for d in values], dtype=int)
+    peak = np.array([d['peak_strength'] for d in values], dtype=float)
+    return list(rule_lifecycles.keys()), birth, death, peak
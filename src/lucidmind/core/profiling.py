@@ -0,0 +1,75 @@
+import time
+from typing import Dict, Any, List
+
+# Phases of one kernel step, in execution order; 'record' covers the
+# per-step outputs of Kernel.step()/run() (entropy, state copies)
+PHASES = ('gating', 'selection', 'apply', 'strength', 'death', 'birth', 'record')
+
+# Event counters accumulated alongside the phase timings
+COUNTERS = ('steps', 'rules_scanned', 'candidates', 'births', 'deaths')
+
+
+class KernelProfiler:
+    """
+    Accumulates wall time and call counts per kernel phase.
+
+    Enabled with config['profile'] = True. The kernel calls lap() at each
+    phase boundary; when profiling is off the kernel holds None and pays
+    one `is not None` check per boundary.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.time = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def lap(self, phase: str, start: float) -> float:
+        """Charges the time since `start` to `phase`; returns the current time."""
+        now = time.perf_counter()
+        self.time[phase] += now - start
+        self.calls[phase] += 1
+        return now
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain-dict view: {'time': ..., 'calls': ..., 'counts': ...}."""
+        return {'time': dict(self.time), 'calls': dict(self.calls), 'counts': dict(self.counts)}
+
+
+def merge_profiles(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sums KernelProfiler.summary() dicts, e.g. across the runs of a batch."""
+    merged = KernelProfiler().summary()
+    for summary in summaries:
+        for section in ('time', 'calls', 'counts'):
+            for key, value in summary[section].items():
+                merged[section][key] = merged[section].get(key, 0) + value
+    return merged
+
+
+def format_profile(summary: Dict[str, Any]) -> str:
+    """Renders a profile summary as a text table for CLI output."""
+    total = sum(summary['time'].values())
+    steps = max(summary['counts'].get('steps', 0), 1)
+    lines = [f"{'phase':<10} {'time (s)':>10} {'share':>7} {'calls':>10} {'us/step':>9}"]
+    for phase in PHASES:
+        t = summary['time'].get(phase, 0.0)
+        share = t / total if total > 0 else 0.0
+        lines.append(
+            f"{phase:<10} {t:>10.4f} {share:>6.1%} {summary['calls'].get(phase, 0):>10d} {1e6 * t / steps:>9.2f}"
+        )
+    lines.append(f"{'total':<10} {total:>10.4f}")
+    counts = summary['counts']
+    lines.append(
+        "steps={steps} rules_scanned={rules_scanned} candidates={candidates} "
+        "births={births} deaths={deaths}".format(**{k: counts.get(k, 0) for k in COUNTERS})
+    )
+    lines.append(
+        f"avg rules scanned/step={counts.get('rules_scanned', 0) / steps:.2f} "
+        f"avg candidates/step={counts.get('candidates', 0) / steps:.2f}"
+    )
+    return "\n".join(lines)
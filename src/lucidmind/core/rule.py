@@ -10,12 +10,12 @@ class Rule:
     
     See: docs/math_core.md#4-transition-operator
     """
-    def __init__(self, w: np.ndarray, b: float, delta: np.ndarray, strength: float = 0.0, uid: str = ""):
+    def __init__(self, w: np.ndarray, b: float, delta: np.ndarray, strength: float = 0.0, uid: int = -1):
         self.w = np.array(w, dtype=float)
         self.b = float(b)
         self.delta = np.array(delta, dtype=float)
         self.strength = float(strength)
-        self.uid = uid
+        self.uid = int(uid)
 
     def gate_prob(self, S: np.ndarray, k: float = 3.0) -> float:
         """
@@ -42,6 +42,14 @@ class Rule:
         """
         return S + self.delta
 
+def softmax(x) -> np.ndarray:
+    """Numerically stable softmax used for strength-weighted rule selection."""
+    x = np.array(x, dtype=float)
+    x = x - np.max(x)
+    ex = np.exp(x)
+    s = np.sum(ex)
+    return ex / s if s > 0 else np.ones_like(ex) / len(ex)
+
 def choose_weighted(rules: List[Rule], T: float = 0.8, rng: Optional[np.random.Generator] = None) -> Rule:
     """
     Selects a rule based on their strengths using softmax with temperature T.
@@ -56,13 +64,6 @@ def choose_weighted(rules: List[Rule], T: float = 0.8, rng: Optional[np.random.G
     Returns:
         The selected Rule instance
     """
-    def softmax(x):
-        x = np.array(x, dtype=float)
-        x = x - np.max(x)
-        ex = np.exp(x)
-        s = np.sum(ex)
-        return ex / s if s > 0 else np.ones_like(ex) / len(ex)
-
     strengths = np.array([r.strength for r in rules], dtype=float)
     weights = softmax(strengths / max(T, 1e-6))
     
@@ -0,0 +1,159 @@
+import copy
+import numpy as np
+from typing import Iterator
+from .rule import Rule, softmax
+
+
+class RuleBank:
+    """
+    Array-backed storage for the live rule set of a Kernel.
+
+    Every rule occupies one slot of contiguous (capacity, N) / (capacity,)
+    arrays, so gating for the whole bank is a single matrix-vector product
+    and the Bernoulli trials are drawn in one batched call.
+
+    With ``reference_compatible=True`` slots are kept in birth order (removal
+    compacts the tail) and gate logits are computed with the same per-row
+    dot product as ``Rule.gate_prob``, so a Kernel using the bank consumes
+    the RNG stream exactly like the list-of-Rule reference. With
+    ``reference_compatible=False`` removal is an O(N) swap with the last slot.
+
+    See: docs/math_core.md#4-transition-operator
+    """
+    def __init__(self, N: int, capacity: int = 64, reference_compatible: bool = True):
+        self.N = N
+        self.reference_compatible = reference_compatible
+        self.n = 0
+
+        capacity = max(int(capacity), 1)
+        self.w = np.zeros((capacity, N))
+        self.b = np.zeros(capacity)
+        self.delta = np.zeros((capacity, N))
+        self.strength = np.zeros(capacity)
+        self.uid = np.full(capacity, -1, dtype=int)
+        # True while w/b/delta are shared with a fork and must be copied before writing
+        self._shared = False
+
+    @property
+    def capacity(self) -> int:
+        return self.w.shape[0]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[Rule]:
+        for slot in range(self.n):
+            yield self.rule(slot)
+
+    def _grow(self):
+        """Doubles the slot capacity, preserving live rows."""
+        new_cap = 2 * self.capacity
+        for name in ('w', 'delta'):
+            old = getattr(self, name)
+            new = np.zeros((new_cap, self.N))
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+        for name in ('b', 'strength', 'uid'):
+            old = getattr(self, name)
+            new = np.zeros(new_cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+        self._shared = False
+
+    def _unshare(self):
+        """Takes private copies of the rule geometry before it is modified."""
+        if self._shared:
+            self.w = self.w.copy()
+            self.b = self.b.copy()
+            self.delta = self.delta.copy()
+            self._shared = False
+
+    def fork(self) -> 'RuleBank':
+        """
+        Returns an independent bank that shares w, b and delta copy-on-write.
+
+        Strengths and uids are small and copied immediately;
+        the geometry arrays are only copied by whichever bank first adds or
+        removes a rule.
+        """
+        clone = copy.copy(self)
+        clone.strength = self.strength.copy()
+        clone.uid = self.uid.copy()
+        self._shared = clone._shared = True
+        return clone
+
+    def add(self, rule: Rule) -> int:
+        """Appends a rule to the first free slot and returns the slot index."""
+        if self.n == self.capacity:
+            self._grow()
+        self._unshare()
+        slot = self.n
+        self.w[slot] = rule.w
+        self.b[slot] = rule.b
+        self.delta[slot] = rule.delta
+        self.strength[slot] = rule.strength
+        self.uid[slot] = rule.uid
+        self.n += 1
+        return slot
+
+    def remove(self, slot: int):
+        """
+        Removes the rule in ``slot``.
+
+        Reference-compatible banks shift the following slots down by one to
+        preserve birth order; otherwise the last live slot is moved into the hole.
+        """
+        self._unshare()
+        last = self.n - 1
+        if self.reference_compatible:
+            for arr in (self.w, self.b, self.delta, self.strength, self.uid):
+                arr[slot:last] = arr[slot + 1:self.n]
+        elif slot != last:
+            for arr in (self.w, self.b, self.delta, self.strength, self.uid):
+                arr[slot] = arr[last]
+        self.n = last
+
+    def rule(self, slot: int) -> Rule:
+        """Returns a standalone Rule snapshot of ``slot``."""
+        return Rule(
+            w=self.w[slot],
+            b=self.b[slot],
+            delta=self.delta[slot],
+            strength=self.strength[slot],
+            uid=int(self.uid[slot])
+        )
+
+    def gate_probs(self, S: np.ndarray, k: float = 3.0) -> np.ndarray:
+        """
+        Gating probabilities of all live rules for state S.
+
+        See: docs/math_core.md#41-soft-gating
+        """
+        n = self.n
+        if self.reference_compatible:
+            # Stacked inner products reduce per row exactly like np.dot(w, S)
+            g = np.matmul(self.w[:n, np.newaxis, :], S[:, np.newaxis])[:, 0, 0] + self.b[:n]
+        else:
+            g = self.w[:n] @ S + self.b[:n]
+        return 1.0 / (1.0 + np.exp(-k * g))
+
+    def gate(self, S: np.ndarray, k: float, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draws one Bernoulli trial per live rule and returns the passing slots.
+
+        ``rng.random(n)`` yields the same doubles as ``n`` scalar draws, so the
+        stream matches the per-rule loop of the reference kernel.
+        """
+        if self.n == 0:
+            return np.zeros(0, dtype=int)
+        p = self.gate_probs(S, k)
+        return np.flatnonzero(rng.random(self.n) < p)
+
+    def choose(self, candidates: np.ndarray, T: float, rng: np.random.Generator) -> int:
+        """
+        Selects one candidate slot by softmax over strengths with temperature T.
+
+        See: docs/math_core.md#43-stochastic-selection
+        """
+        weights = softmax(self.strength[candidates] / max(T, 1e-6))
+        return int(candidates[rng.choice(len(candidates), p=weights)])
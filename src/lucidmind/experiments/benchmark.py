@@ -0,0 +1,249 @@
+import json
+import os
+import platform
+import subprocess
+import time
+import numpy as np
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from ..core.kernel import Kernel
+from ..config.defaults import DEFAULT_CONFIG
+from ..analysis.stability import classify_run, compute_stability_report
+from ..metrics.trajectory import compute_pairwise_distances
+from ..metrics.aggregator import aggregate_metrics
+from .runner import ExperimentRunner
+
+# Case grids: the full suite and a reduced one for quick checks
+FULL_SIZES = {
+    'kernel_step': [(N, rules) for N in (32, 1024, 32768, 100000) for rules in (0, 16, 256)],
+    'run_metrics_only': [1000, 5000],
+    'classify': [(10, 1000), (100, 1000), (100, 10000)],
+    'pairwise': [(10, 1000), (50, 1000), (10, 10000)],
+    'aggregate': [(10, 1000), (100, 1000), (100, 10000)]
+}
+QUICK_SIZES = {
+    'kernel_step': [(N, rules) for N in (32, 1024) for rules in (0, 16)],
+    'run_metrics_only': [500],
+    'classify': [(10, 1000)],
+    'pairwise': [(10, 1000)],
+    'aggregate': [(10, 1000)]
+}
+
+
+def git_commit(path: str = ".") -> str:
+    """Short hash of HEAD, suffixed with '-dirty' for uncommitted tracked changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "diff", "--quiet", "HEAD"], cwd=path, capture_output=True
+        ).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> float:
+    """
+    Best-of-`repeat` wall time of fn(), in seconds.
+
+    Each repeat calls fn as many times as fit in min_time (at least once)
+    and counts the mean, so microsecond-scale calls are not dominated by
+    timer resolution.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        n, start = 0, time.perf_counter()
+        while True:
+            fn()
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / n)
+    return best
+
+
+def _preloaded_kernel(config: Dict[str, Any], n_rules: int, seed: int = 0) -> Kernel:
+    """Kernel with n_rules live rules synthesized from random windows."""
+    rng = np.random.default_rng(seed)
+    kernel = Kernel(config, rng=np.random.default_rng(seed))
+    for _ in range(n_rules):
+        rule = kernel.synthesize_rule_from_memory(rng.normal(0, 0.3, size=(kernel.birth_window, kernel.N)))
+        kernel.born_total += 1
+        kernel.rule_lifecycles.add(rule.uid, 0)
+        if kernel.rule_engine == 'bank':
+            kernel.rules.add(rule)
+        else:
+            kernel.rules.append(rule)
+    return kernel
+
+
+def _synthetic_metrics(n_runs: int, T: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'complexity_history': rng.integers(5, 25, size=T).tolist(),
+            'entropy_history': rng.uniform(0.0, 3.5, size=T).tolist(),
+            'damping_ratio': float(rng.uniform(0.0, 1.0)),
+            'born_total': int(rng.integers(0, 100)),
+            'alive_count': int(rng.integers(0, 50))
+        }
+        for _ in range(n_runs)
+    ]
+
+
+def bench_kernel_step(N: int, n_rules: int, engine: str, steps: int = 50) -> Dict[str, Any]:
+    config = {**DEFAULT_CONFIG, 'N': N, 'rule_engine': engine}
+    base = _preloaded_kernel(config, n_rules)
+
+    def run():
+        kernel = base.fork()
+        for _ in range(steps):
+            kernel.step()
+
+    seconds = time_call(run) / steps
+    return {'seconds': seconds, 'unit': 'step', 'rate': 1.0 / seconds}
+
+
+def bench_run_metrics_only(T: int, engine: str) -> Dict[str, Any]:
+    runner = ExperimentRunner({**DEFAULT_CONFIG, 'T': T, 'rule_engine': engine})
+    seconds = time_call(lambda: runner.run_metrics_only(seed=0), repeat=3, min_time=0.0)
+    return {'seconds': seconds, 'unit': 'run', 'rate': T / seconds}
+
+
+def bench_classify_run(n_runs: int, T: int) -> Dict[str, Any]:
+    metrics = _synthetic_metrics(n_runs, T)
+    seconds = time_call(lambda: [classify_run(m) for m in metrics]) / n_runs
+    return {'seconds': seconds, 'unit': 'run', 'rate': 1.0 / seconds}
+
+
+def bench_stability_report(n_runs: int, T: int) -> Dict[str, Any]:
+    metrics = _synthetic_metrics(n_runs, T)
+    seconds = time_call(lambda: compute_stability_report(metrics))
+    return {'seconds': seconds, 'unit': 'report', 'rate': n_runs / seconds}
+
+
+def bench_pairwise(n_runs: int, T: int, N: int = 32) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    trajectories = [rng.normal(size=(T, N)) for _ in range(n_runs)]
+    seconds = time_call(lambda: compute_pairwise_distances(trajectories), repeat=3)
+    return {'seconds': seconds, 'unit': 'call', 'rate': T / seconds}
+
+
+def bench_aggregate(n_runs: int, T: int) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    runs = [{'complexity': rng.integers(5, 25, size=T), 'entropy': rng.uniform(0, 3.5, size=T)} for _ in range(n_runs)]
+    seconds = time_call(lambda: aggregate_metrics(runs), repeat=3)
+    return {'seconds': seconds, 'unit': 'call', 'rate': T / seconds}
+
+
+def run_suite(
+    quick: bool = False,
+    engines: Tuple[str, ...] = ('list', 'bank'),
+    only: Optional[str] = None,
+    verbose: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the benchmark suite.
+
+    Args:
+        quick: Use the reduced QUICK_SIZES grid
+        engines: Kernel rule engines to time
+        only: Substring filter on benchmark names
+        verbose: Print each result as it finishes
+
+    Returns:
+        Benchmark name -> {'seconds', 'unit', 'rate'}; seconds is the best
+        time per unit (lower is better)
+    """
+    sizes = QUICK_SIZES if quick else FULL_SIZES
+    cases: List[Tuple[str, Callable[[], Any]]] = []
+    for engine in engines:
+        for N, n_rules in sizes['kernel_step']:
+            cases.append((f"kernel_step[{engine},N={N},rules={n_rules}]",
+                          lambda N=N, n_rules=n_rules, engine=engine: bench_kernel_step(N, n_rules, engine)))
+        for T in sizes['run_metrics_only']:
+            cases.append((f"run_metrics_only[{engine},T={T}]",
+                          lambda T=T, engine=engine: bench_run_metrics_only(T, engine)))
+    for n_runs, T in sizes['classify']:
+        cases.append((f"classify_run[runs={n_runs},T={T}]",
+                      lambda n_runs=n_runs, T=T: bench_classify_run(n_runs, T)))
+        cases.append((f"compute_stability_report[runs={n_runs},T={T}]",
+                      lambda n_runs=n_runs, T=T: bench_stability_report(n_runs, T)))
+    for n_runs, T in sizes['pairwise']:
+        cases.append((f"compute_pairwise_distances[runs={n_runs},T={T}]",
+                      lambda n_runs=n_runs, T=T: bench_pairwise(n_runs, T)))
+    for n_runs, T in sizes['aggregate']:
+        cases.append((f"aggregate_metrics[runs={n_runs},T={T}]",
+                      lambda n_runs=n_runs, T=T: bench_aggregate(n_runs, T)))
+
+    results = {}
+    for name, case in cases:
+        if only and only not in name:
+            continue
+        results[name] = case()
+        if verbose:
+            print(f"  {name:<55} {results[name]['seconds'] * 1e3:>10.3f} ms/{results[name]['unit']}")
+    return results
+
+
+def save_results(path: str, commit: str, results: Dict[str, Dict[str, Any]]):
+    """Stores results under `commit` in the JSON file at path (other commits are kept)."""
+    history = load_results(path) if os.path.exists(path) else {}
+    history[commit] = {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results
+    }
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(
+    base: Dict[str, Dict[str, Any]],
+    head: Dict[str, Dict[str, Any]],
+    threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """
+    Compares two result sets benchmark by benchmark.
+
+    Args:
+        base: 'results' of the reference commit
+        head: 'results' of the commit under test
+        threshold: Relative slowdown (0.2 = 20%) that counts as a regression
+
+    Returns:
+        One row per benchmark of either side: name, base and head seconds,
+        ratio head / base and status ('regression', 'improvement', 'ok',
+        'missing' for base benchmarks absent from head, e.g. crashed or
+        filtered out, or 'new' for head-only ones; base, head and ratio are
+        None where a side is absent)
+    """
+    rows = []
+    for name in sorted(set(base) | set(head)):
+        if name not in head:
+            rows.append({'name': name, 'base': base[name]['seconds'], 'head': None, 'ratio': None, 'status': 'missing'})
+            continue
+        if name not in base:
+            rows.append({'name': name, 'base': None, 'head': head[name]['seconds'], 'ratio': None, 'status': 'new'})
+            continue
+        b, h = base[name]['seconds'], head[name]['seconds']
+        ratio = h / b if b > 0 else float('inf')
+        if ratio > 1.0 + threshold:
+            status = 'regression'
+        elif ratio < 1.0 / (1.0 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'base': b, 'head': h, 'ratio': ratio, 'status': status})
+    return rows
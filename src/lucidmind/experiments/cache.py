@@ -0,0 +1,227 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+from ..config.defaults import DEFAULT_CONFIG
+from ..core.kernel import Kernel, KERNEL_VERSION
+
+# Options that change how a run is executed or reported, not its trajectory
+EXECUTION_KEYS = ('rule_engine', 'profile', 'early_stop', 'early_stop_every', 'early_stop_patience')
+
+# Write counter shared by all processes using a cache root
+PUT_COUNTER = "puts.count"
+
+
+def canonical_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges a config with the defaults (as load_config does) and normalizes
+    NumPy scalars, so equal configurations compare and hash equally.
+    """
+    merged = {**DEFAULT_CONFIG, **config}
+    return {k: (v.item() if isinstance(v, np.generic) else v) for k, v in sorted(merged.items())}
+
+
+def _dynamics_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    canonical_config without the EXECUTION_KEYS, so they do not split cache
+    entries. reference_compatible is kept: a bank with
+    reference_compatible=False follows its own trajectory, while the list
+    engine and a reference-compatible bank are bit-identical and share True.
+    """
+    merged = canonical_config(config)
+    merged['reference_compatible'] = merged['rule_engine'] != 'bank' or bool(merged['reference_compatible'])
+    return {k: v for k, v in merged.items() if k not in EXECUTION_KEYS}
+
+
+def result_key(config: Dict[str, Any], seed: int, T: int) -> str:
+    """Content hash of (merged config without EXECUTION_KEYS, seed, T, kernel version)."""
+    payload = json.dumps(
+        {'config': _dynamics_config(config), 'seed': int(seed), 'T': int(T), 'kernel': KERNEL_VERSION},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def lineage_key(config: Dict[str, Any], seed: int) -> str:
+    """
+    Content hash of (merged config without T and EXECUTION_KEYS, seed,
+    kernel version).
+    
+    Runs of the same lineage differ only in their horizon, so a shorter one
+    is a prefix of a longer one.
+    """
+    merged = _dynamics_config(config)
+    merged.pop('T', None)
+    payload = json.dumps({'config': merged, 'seed': int(seed), 'kernel': KERNEL_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Writes via a temporary file and os.replace so readers never see partial files."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ResultCache:
+    """
+    Persistent content-addressed cache of run_metrics_only results.
+
+    Each entry is a small .npz file named by result_key() and sharded into
+    256 subdirectories. Entries are written to a temporary file and moved
+    into place atomically, so concurrent writers from several processes
+    are safe (identical keys hold identical results). Hits refresh the file
+    mtime; when the cache grows past max_bytes the least recently used
+    entries are evicted.
+    
+    End-of-run kernel checkpoints are stored next to the metrics, keyed by
+    lineage_key() and T, so a run can later be extended to a longer horizon.
+    They count against max_bytes like the metrics entries.
+    
+    Writes are counted in a file shared by every process using the root
+    (pool workers get pickled copies of this object), and every
+    evict_every-th write runs evict().
+    """
+    def __init__(self, root: str, max_bytes: int = 1 << 30, evict_every: int = 64):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._counter = os.path.join(root, PUT_COUNTER)
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".npz")
+
+    def get(self, config: Dict[str, Any], seed: int, T: int) -> Optional[Dict[str, Any]]:
+        """Returns the cached metrics dict, or None on a miss."""
+        path = self._path(result_key(config, seed, T))
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metrics = {
+                    'complexity_history': data['complexity_history'].astype(int).tolist(),
+                    'entropy_history': data['entropy_history'].tolist(),
+                    'damping_ratio': float(data['damping_ratio']),
+                    'born_total': int(data['born_total']),
+                    'alive_count': int(data['alive_count'])
+                }
+            os.utime(path)
+        except (FileNotFoundError, OSError, KeyError, ValueError, zipfile.BadZipFile):
+            # Missing or truncated entries are misses
+            return None
+        return metrics
+
+    def put(self, config: Dict[str, Any], seed: int, T: int, metrics: Dict[str, Any]):
+        """Stores a metrics dict produced by run_metrics_only."""
+        path = self._path(result_key(config, seed, T))
+
+        comp = np.asarray(metrics['complexity_history'])
+        # Complexity is a count of at most N components
+        comp_dtype = np.min_scalar_type(int(comp.max())) if len(comp) else np.uint8
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            complexity_history=comp.astype(comp_dtype),
+            entropy_history=np.asarray(metrics['entropy_history'], dtype=np.float64),
+            damping_ratio=np.float64(metrics['damping_ratio']),
+            born_total=np.int64(metrics['born_total']),
+            alive_count=np.int64(metrics['alive_count'])
+        )
+
+        _atomic_write(path, buf.getvalue())
+        self._count_put()
+
+    def _count_put(self):
+        # One byte per write; O_APPEND makes the offset after our byte the shared count
+        fd = os.open(self._counter, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+        try:
+            os.write(fd, b"\0")
+            puts = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        if puts >= self.evict_every:
+            os.truncate(self._counter, 0)
+            self.evict()
+
+    def _checkpoint_path(self, config: Dict[str, Any], seed: int, T: int) -> str:
+        key = lineage_key(config, seed)
+        return os.path.join(self.root, key[:2], f"{key}.T{int(T)}.ckpt.npz")
+
+    def put_checkpoint(self, config: Dict[str, Any], seed: int, T: int, kernel: Kernel):
+        """Stores the kernel state at the end of a T-step run."""
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **kernel.snapshot())
+        _atomic_write(self._checkpoint_path(config, seed, T), buf.getvalue())
+        self._count_put()
+
+    def latest_checkpoint(self, config: Dict[str, Any], seed: int, T: int) -> Optional[Tuple[int, Kernel, Dict[str, Any]]]:
+        """
+        Finds the longest cached run of the same lineage shorter than T.
+        
+        Returns:
+            (T0, kernel restored at step T0, metrics of the T0-step run),
+            or None if no usable checkpoint/metrics pair is cached
+        """
+        key = lineage_key(config, seed)
+        pattern = os.path.join(self.root, key[:2], f"{key}.T*.ckpt.npz")
+        horizons = []
+        for path in glob.glob(pattern):
+            try:
+                horizons.append((int(path.rsplit('.T', 1)[1].split('.')[0]), path))
+            except ValueError:
+                continue
+                
+        for T0, path in sorted(horizons, reverse=True):
+            if T0 >= T:
+                continue
+            metrics = self.get(config, seed, T0)
+            if metrics is None:
+                continue
+            try:
+                kernel = Kernel.load_checkpoint(path, config=config)
+                os.utime(path)
+            except (FileNotFoundError, OSError, KeyError, ValueError, zipfile.BadZipFile):
+                continue
+            return T0, kernel, metrics
+        return None
+
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".npz"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, st.st_mtime, st.st_size
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process evicted it first
+                pass
+            total -= size
@@ -0,0 +1,296 @@
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+from ..metrics.rules import compute_damping_ratio
+from .cache import canonical_config
+from .columnar import last_row
+
+CATALOG_FILE = "catalog.sqlite"
+
+# Fixed columns; every scalar config parameter gets a column of its own
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_dir TEXT NOT NULL,
+    timestamp TEXT,
+    updated REAL,
+    n_steps INTEGER,
+    final_complexity INTEGER,
+    final_entropy REAL,
+    final_n_rules INTEGER,
+    final_rule_strength REAL,
+    born_total INTEGER,
+    died_total INTEGER,
+    damping_ratio REAL,
+    config TEXT,
+    config_path TEXT,
+    metrics_path TEXT,
+    trajectory_path TEXT,
+    checkpoint_path TEXT,
+    profile_path TEXT
+);
+"""
+_FIXED_COLUMNS = (
+    'run_id', 'run_dir', 'timestamp', 'updated', 'n_steps', 'final_complexity', 'final_entropy',
+    'final_n_rules', 'final_rule_strength', 'born_total', 'died_total', 'damping_ratio', 'config',
+    'config_path', 'metrics_path', 'trajectory_path', 'checkpoint_path', 'profile_path'
+)
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _last_csv_row(path: str) -> Optional[Dict[str, str]]:
+    """Header plus last line of a CSV file, reading only its two ends."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        if end <= body_start:
+            return None
+        block = 4096
+        while True:
+            start = max(body_start, end - block)
+            f.seek(start)
+            tail = f.read(end - start).rstrip(b"\r\n")
+            if b"\n" in tail or start == body_start:
+                break
+            block *= 2
+    line = tail.rsplit(b"\n", 1)[-1]
+    rows = list(csv.DictReader(io.StringIO((header + line).decode())))
+    return rows[0] if rows else None
+
+
+def seed_text(seed: Any) -> Optional[str]:
+    """
+    Catalog form of a seed: zero-padded decimal text.
+
+    derive_seeds output spans the full uint64 range, past SQLite's 64-bit
+    signed integers, so every seed is stored as 20-digit text; text order
+    then equals numeric order for ORDER BY and range conditions (pass
+    seed_text() values as their parameters).
+    """
+    return None if seed is None else f"{int(seed):020d}"
+
+
+def _sql_value(value: Any, key: Optional[str] = None) -> Any:
+    """SQLite integers are 64-bit; larger ints are stored as text, seeds always (see seed_text)."""
+    if key == 'seed':
+        return seed_text(value)
+    if isinstance(value, int) and not isinstance(value, bool) and not -2**63 <= value < 2**63:
+        return str(value)
+    return value
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def describe_run(run_dir: str) -> Dict[str, Any]:
+    """
+    Reads one run directory into a catalog row.
+
+    Only config.json and the last metrics row are read (metrics.bin via
+    its chunk headers, metrics.csv from its end), so indexing cost does not
+    grow with T. The config is merged with the defaults, so parameters a
+    run left at their default values are queryable too.
+    """
+    config_path = os.path.join(run_dir, "config.json")
+    with open(config_path) as f:
+        config = canonical_config(json.load(f))
+
+    columns_path = os.path.join(run_dir, "metrics.bin")
+    csv_path = os.path.join(run_dir, "metrics.csv")
+    n_steps, last, metrics_path = None, None, None
+    if os.path.exists(columns_path):
+        metrics_path = columns_path
+        n_steps, last = last_row(columns_path)
+    elif os.path.exists(csv_path):
+        metrics_path = csv_path
+        last = _last_csv_row(csv_path)
+        if last is not None and _number(last.get('step')) is not None:
+            n_steps = int(float(last['step']))
+    last = last or {}
+
+    born, died = _number(last.get('born')), _number(last.get('died'))
+    name = os.path.basename(os.path.normpath(run_dir))
+    optional = {
+        'trajectory_path': "trajectory.npy",
+        'checkpoint_path': "checkpoint.npz",
+        'profile_path': "profile.json"
+    }
+    row = {
+        'run_id': name,
+        'run_dir': run_dir,
+        'timestamp': name[len("run_"):] if name.startswith("run_") else None,
+        'updated': os.path.getmtime(config_path),
+        'n_steps': n_steps,
+        'final_complexity': _number(last.get('complexity')),
+        'final_entropy': _number(last.get('entropy')),
+        'final_n_rules': _number(last.get('n_rules')),
+        'final_rule_strength': _number(last.get('rule_strength')),
+        'born_total': born,
+        'died_total': died,
+        'damping_ratio': compute_damping_ratio(int(died), int(born)) if born is not None and died is not None else None,
+        'config': json.dumps(config, sort_keys=True),
+        'config_path': config_path,
+        'metrics_path': metrics_path,
+        **{
+            key: os.path.join(run_dir, file) if os.path.exists(os.path.join(run_dir, file)) else None
+            for key, file in optional.items()
+        }
+    }
+    # Scalar parameters become queryable columns (list/dict values stay in 'config')
+    for key, value in config.items():
+        if isinstance(value, (int, float, str, bool)) and _IDENTIFIER.match(key) and key not in _FIXED_COLUMNS:
+            row[key] = _sql_value(value, key)
+    return row
+
+
+class RunCatalog:
+    """
+    SQLite index of the run_* directories under an output root.
+
+    One row per run with its scalar config parameters (one column each,
+    e.g. tau, seed, T), final statistics from the last metrics row and the
+    paths of its files, so runs can be found without opening every
+    directory. Seeds are stored as seed_text(). The index lives in
+    <root>/catalog.sqlite; the run directories stay the source of truth: a
+    missing index is rebuilt from disk on open, and sync() picks up runs
+    written or extended without it.
+    """
+    def __init__(self, root: str, path: Optional[str] = None, timeout: float = 60.0):
+        self.root = root
+        self.path = path or os.path.join(root, CATALOG_FILE)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        missing = not os.path.exists(self.path)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        if missing or self._has_numeric_seeds():
+            self.rebuild()
+
+    def close(self):
+        self.conn.close()
+
+    def _has_numeric_seeds(self) -> bool:
+        """Indexes written before seeds were stored as seed_text() need a rebuild."""
+        if 'seed' not in self.columns():
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM runs WHERE seed IS NOT NULL AND typeof(seed) != 'text' LIMIT 1"
+        ).fetchone() is not None
+
+    def columns(self) -> List[str]:
+        return [row[1] for row in self.conn.execute("PRAGMA table_info(runs)")]
+
+    def _ensure_columns(self, rows: Sequence[Dict[str, Any]]):
+        existing = set(self.columns())
+        for key in sorted({k for row in rows for k in row} - existing):
+            try:
+                self.conn.execute(f'ALTER TABLE runs ADD COLUMN "{key}"')
+            except sqlite3.OperationalError as e:
+                # Another process added it first
+                if "duplicate column" not in str(e):
+                    raise
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS "runs_{key}" ON runs ("{key}")')
+
+    def _upsert(self, rows: Sequence[Dict[str, Any]]):
+        self._ensure_columns(rows)
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row in rows:
+                keys = list(row)
+                names = ", ".join(f'"{k}"' for k in keys)
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO runs ({names}) VALUES ({', '.join('?' * len(keys))})",
+                    [row[k] for k in keys]
+                )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _run_dirs(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if name.startswith("run_") and os.path.exists(os.path.join(self.root, name, "config.json"))
+        )
+
+    def record(self, run_dir: str):
+        """Adds or refreshes the row of one run directory."""
+        self._upsert([describe_run(run_dir)])
+
+    def rebuild(self) -> int:
+        """Re-indexes every run directory under root; returns the number of runs."""
+        rows = [describe_run(d) for d in self._run_dirs()]
+        self.conn.execute("DELETE FROM runs")
+        if rows:
+            self._upsert(rows)
+        return len(rows)
+
+    def sync(self) -> int:
+        """
+        Indexes new or changed run directories and drops vanished ones.
+
+        Returns:
+            Number of rows added or refreshed
+        """
+        indexed = {row['run_id']: row['updated'] for row in self.conn.execute("SELECT run_id, updated FROM runs")}
+        on_disk = {os.path.basename(d): d for d in self._run_dirs()}
+        stale = [
+            d for name, d in on_disk.items()
+            if indexed.get(name) != os.path.getmtime(os.path.join(d, "config.json"))
+        ]
+        gone = [name for name in indexed if name not in on_disk]
+        if gone:
+            self.conn.executemany("DELETE FROM runs WHERE run_id = ?", [(name,) for name in gone])
+        if stale:
+            self._upsert([describe_run(d) for d in stale])
+        return len(stale)
+
+    def query(
+        self,
+        where: Optional[str] = None,
+        params: Sequence[Any] = (),
+        order_by: str = "run_id",
+        **equals: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Selects runs.
+
+        Args:
+            where: Optional SQL condition, e.g. "tau BETWEEN ? AND ?"
+            params: Parameters of `where`
+            order_by: SQL ordering expression
+            **equals: Column = value filters, e.g. tau=0.2, seed=42
+
+        Returns:
+            Matching rows as dicts
+        """
+        columns = set(self.columns())
+        clauses, values = [], []
+        for key, value in equals.items():
+            if key not in columns:
+                raise ValueError(f"Unknown catalog column '{key}'")
+            clauses.append(f'"{key}" = ?')
+            values.append(_sql_value(value, key))
+        if where:
+            clauses.append(f"({where})")
+            values.extend(params)
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by}"
+        return [dict(row) for row in self.conn.execute(sql, values)]
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
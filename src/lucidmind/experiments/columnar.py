@@ -0,0 +1,134 @@
+import json
+import os
+import struct
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# File layout:
+#   MAGIC, uint32 header length, JSON header [[name, dtype], ...]
+#   then any number of chunks: uint32 n_rows, followed by each column's
+#   n_rows values as contiguous little-endian bytes in header order.
+# A truncated trailing chunk (e.g. after a crash) is ignored by readers.
+MAGIC = b"LMCOL1\n"
+_U32 = struct.Struct("<I")
+
+
+class ColumnarWriter:
+    """
+    Append-only writer for chunked columnar binary files.
+    
+    With append=True an existing file with the same columns is continued
+    after its last complete chunk (a truncated trailing chunk is dropped).
+    """
+    def __init__(self, path: str, columns: List[Tuple[str, str]], append: bool = False):
+        self.path = path
+        self.columns = [(name, np.dtype(dtype).newbyteorder('<')) for name, dtype in columns]
+        self.n_rows = 0
+        if append and os.path.exists(path):
+            self._f = open(path, 'r+b')
+            existing = _read_header(self._f)
+            if [(n, d.str) for n, d in existing] != [(n, d.str) for n, d in self.columns]:
+                self._f.close()
+                raise ValueError(f"Column layout of {path} does not match")
+            end = self._f.tell()
+            for chunk in iter_chunks(path):
+                self.n_rows += len(chunk[self.columns[0][0]])
+                end += _U32.size + sum(len(col) * col.itemsize for col in chunk.values())
+            self._f.seek(end)
+            self._f.truncate()
+            return
+            
+        header = json.dumps([[name, dtype.str] for name, dtype in self.columns]).encode()
+        self._f = open(path, 'wb')
+        self._f.write(MAGIC + _U32.pack(len(header)) + header)
+        self._f.flush()
+
+    def write_chunk(self, data: Dict[str, np.ndarray]):
+        """Appends one chunk; every column must have the same length."""
+        n = len(data[self.columns[0][0]])
+        parts = [_U32.pack(n)]
+        for name, dtype in self.columns:
+            col = np.ascontiguousarray(data[name], dtype=dtype)
+            if len(col) != n:
+                raise ValueError(f"Column '{name}' has {len(col)} rows, expected {n}")
+            parts.append(col.tobytes())
+        self._f.write(b"".join(parts))
+        self._f.flush()
+        self.n_rows += n
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+
+def _read_header(f) -> List[Tuple[str, np.dtype]]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a LucidMind columnar file")
+    (length,) = _U32.unpack(f.read(_U32.size))
+    return [(name, np.dtype(dtype)) for name, dtype in json.loads(f.read(length))]
+
+
+def iter_chunks(path: str) -> Iterator[Dict[str, np.ndarray]]:
+    """Yields the file chunk by chunk as dicts of column arrays."""
+    with open(path, 'rb') as f:
+        columns = _read_header(f)
+        row_bytes = sum(dtype.itemsize for _, dtype in columns)
+        while True:
+            raw = f.read(_U32.size)
+            if len(raw) < _U32.size:
+                return
+            (n,) = _U32.unpack(raw)
+            body = f.read(n * row_bytes)
+            if len(body) < n * row_bytes:
+                return
+            chunk, offset = {}, 0
+            for name, dtype in columns:
+                size = n * dtype.itemsize
+                chunk[name] = np.frombuffer(body, dtype=dtype, count=n, offset=offset)
+                offset += size
+            yield chunk
+
+
+def last_row(path: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    Returns (number of rows, last row as a dict or None).
+    
+    Seeks over chunk bodies, so only the chunk headers and the final row are read.
+    """
+    with open(path, 'rb') as f:
+        columns = _read_header(f)
+        row_bytes = sum(dtype.itemsize for _, dtype in columns)
+        n_rows, last = 0, None
+        while True:
+            raw = f.read(_U32.size)
+            if len(raw) < _U32.size:
+                break
+            (n,) = _U32.unpack(raw)
+            start = f.tell()
+            if f.seek(0, os.SEEK_END) < start + n * row_bytes:
+                break
+            if n:
+                n_rows += n
+                last = (start, n)
+            f.seek(start + n * row_bytes)
+        if last is None:
+            return 0, None
+        start, n = last
+        row, offset = {}, start
+        for name, dtype in columns:
+            # Columns are stored one after another within a chunk
+            f.seek(offset + (n - 1) * dtype.itemsize)
+            row[name] = np.frombuffer(f.read(dtype.itemsize), dtype=dtype)[0].item()
+            offset += n * dtype.itemsize
+        return n_rows, row
+
+
+def read_columns(path: str) -> Dict[str, np.ndarray]:
+    """Reads a whole columnar file into one array per column."""
+    with open(path, 'rb') as f:
+        columns = _read_header(f)
+    chunks = list(iter_chunks(path))
+    return {
+        name: np.concatenate([c[name] for c in chunks]) if chunks else np.zeros(0, dtype=dtype)
+        for name, dtype in columns
+    }
@@ -2,26 +2,71 @@ import json
 import os
 import csv
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
+from .columnar import ColumnarWriter, iter_chunks
+
+# Per-step metric columns (CSV column order) and their binary dtypes
+METRIC_COLUMNS = [
+    ('step', 'i8'),
+    ('complexity', 'i8'),
+    ('entropy', 'f8'),
+    ('n_rules', 'i8'),
+    ('gain', 'i8'),
+    ('born', 'i8'),
+    ('died', 'i8'),
+    ('rule_strength', 'f8'),
+]
 
 class ExperimentLogger:
     """
     Handles logging of experiment metrics and state trajectories.
+    
+    By default every step is kept in memory until save() writes metrics.csv.
+    With streaming=True rows are buffered in typed column arrays of
+    chunk_size rows and appended to metrics.bin whenever the buffer fills,
+    so memory stays constant in T and completed chunks survive a crash;
+    export_csv() produces metrics.csv from the binary file on demand.
+    
+    Passing an existing run_dir reopens that run for appending, so an
+    extended run continues its metrics and trajectory files in place.
     """
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, streaming: bool = False, chunk_size: int = 4096, run_dir: Optional[str] = None):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Use microseconds to avoid collisions in rapid batch runs
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        self.run_dir = os.path.join(output_dir, f"run_{self.timestamp}")
-        os.makedirs(self.run_dir, exist_ok=True)
+        self.append = run_dir is not None
+        if self.append:
+            self.run_dir = run_dir
+            self.timestamp = os.path.basename(os.path.normpath(run_dir))[len("run_"):]
+        else:
+            # Use microseconds to avoid collisions in rapid batch runs; parallel
+            # workers can still collide, so retry until the directory is new
+            while True:
+                self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                self.run_dir = os.path.join(output_dir, f"run_{self.timestamp}")
+                try:
+                    os.makedirs(self.run_dir)
+                    break
+                except FileExistsError:
+                    continue
         
         self.metrics_file = os.path.join(self.run_dir, "metrics.csv")
         self.config_file = os.path.join(self.run_dir, "config.json")
         
+        self.columns_file = os.path.join(self.run_dir, "metrics.bin")
+        self.trajectory_file = os.path.join(self.run_dir, "trajectory.npy")
+        self.checkpoint_file = os.path.join(self.run_dir, "checkpoint.npz")
+        self._trajectory: Optional[np.memmap] = None
+        
         self.history: List[Dict[str, Any]] = []
+        
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self._writer: Optional[ColumnarWriter] = None
+        self._n_buffered = 0
+        if streaming:
+            self._buffers = {name: np.zeros(chunk_size, dtype=dtype) for name, dtype in METRIC_COLUMNS}
 
     def log_config(self, config: Dict[str, Any]):
         """Saves experiment configuration."""
@@ -39,20 +84,166 @@ class ExperimentLogger:
         else:
             data['rule_strength'] = None
             
+        if self.streaming:
+            i = self._n_buffered
+            for name, _ in METRIC_COLUMNS:
+                value = data.get(name)
+                self._buffers[name][i] = np.nan if value is None and name == 'rule_strength' else (value or 0)
+            self._n_buffered += 1
+            if self._n_buffered == self.chunk_size:
+                self.flush()
+            return
+            
         self.history.append(data)
 
+    def log_steps(self, columns: Dict[str, np.ndarray], start_step: int = 1):
+        """
+        Logs a block of consecutive steps given as per-step value arrays.
+        
+        Produces the same rows as calling log_step once per step; NaN in
+        'rule_strength' marks steps where no rule was applied.
+        """
+        if self.streaming:
+            self._buffer_block(columns, start_step)
+            return
+            
+        names = [k for k in ('complexity', 'entropy', 'n_rules', 'gain', 'born', 'died') if k in columns]
+        n = len(columns[names[0]]) if names else 0
+        values = [columns[k].tolist() for k in names]
+        strengths = columns['rule_strength'].tolist() if 'rule_strength' in columns else [None] * n
+        
+        for i in range(n):
+            data = {'step': start_step + i}
+            for k, v in zip(names, values):
+                data[k] = v[i]
+            s = strengths[i]
+            data['rule_strength'] = None if s is None or s != s else s
+            self.history.append(data)
+
+    def _buffer_block(self, columns: Dict[str, np.ndarray], start_step: int):
+        """Copies a block of steps into the column buffers, flushing full chunks."""
+        n = max((len(v) for v in columns.values()), default=0)
+        done = 0
+        while done < n:
+            i = self._n_buffered
+            k = min(self.chunk_size - i, n - done)
+            for name, _ in METRIC_COLUMNS:
+                buf = self._buffers[name]
+                if name == 'step':
+                    buf[i:i + k] = np.arange(start_step + done, start_step + done + k)
+                elif name in columns:
+                    buf[i:i + k] = columns[name][done:done + k]
+                else:
+                    buf[i:i + k] = np.nan if name == 'rule_strength' else 0
+            self._n_buffered += k
+            done += k
+            if self._n_buffered == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Appends buffered rows to metrics.bin (streaming mode only)."""
+        if not self.streaming:
+            return
+        if self._writer is None:
+            self._writer = ColumnarWriter(self.columns_file, METRIC_COLUMNS, append=self.append)
+        if self._n_buffered:
+            n = self._n_buffered
+            self._writer.write_chunk({name: buf[:n] for name, buf in self._buffers.items()})
+            self._n_buffered = 0
+
+    def export_csv(self, path: Optional[str] = None) -> str:
+        """
+        Writes metrics.csv (or `path`) from the streamed binary metrics.
+        
+        Rows are converted chunk by chunk, so memory stays bounded.
+        """
+        path = path or self.metrics_file
+        if not self.streaming:
+            self.save()
+            return path
+            
+        self.flush()
+        export_metrics_csv(self.columns_file, path)
+        return path
+
     def save(self):
-        """Saves collected history to CSV."""
+        """Saves collected history to CSV (streaming mode: flushes metrics.bin)."""
+        if self.streaming:
+            self.flush()
+            self._writer.close()
+            return
+            
         if not self.history:
             return
             
         keys = self.history[0].keys()
-        with open(self.metrics_file, 'w', newline='') as f:
+        append = self.append and os.path.exists(self.metrics_file)
+        with open(self.metrics_file, 'a' if append else 'w', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
+            if not append:
+                writer.writeheader()
             writer.writerows(self.history)
             
-    def save_trajectory(self, trajectory: List[np.ndarray]):
+    def save_trajectory(self, trajectory: Union[List[np.ndarray], np.ndarray]):
         """Saves full state trajectory to a numpy file."""
-        traj_file = os.path.join(self.run_dir, "trajectory.npy")
-        np.save(traj_file, np.array(trajectory))
+        np.save(self.trajectory_file, np.array(trajectory))
+
+    def open_trajectory(self, T: int, N: int) -> np.memmap:
+        """
+        Preallocates trajectory.npy as a writable (T, N) memory map.
+        
+        States written into the returned array (e.g. as the 'state' buffer
+        of Kernel.run) go straight to disk, so the trajectory is never held
+        in RAM. Call close_trajectory() when done.
+        """
+        self._trajectory = np.lib.format.open_memmap(
+            self.trajectory_file, mode='w+', dtype=np.float64, shape=(T, N)
+        )
+        return self._trajectory
+
+    def extend_trajectory(self, T: int, N: int, chunk_rows: int = 4096) -> np.memmap:
+        """
+        Grows an existing trajectory.npy to T rows and opens it like open_trajectory().
+        
+        Existing rows are copied chunk by chunk into a new file that then
+        replaces the old one, so memory stays bounded by chunk_rows.
+        """
+        old = np.load(self.trajectory_file, mmap_mode='r')
+        if old.shape[1] != N or len(old) > T:
+            raise ValueError(f"Cannot extend trajectory of shape {old.shape} to ({T}, {N})")
+            
+        tmp = self.trajectory_file + ".tmp.npy"
+        new = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=(T, N))
+        for i in range(0, len(old), chunk_rows):
+            j = min(i + chunk_rows, len(old))
+            new[i:j] = old[i:j]
+        del old
+        new.flush()
+        # The map stays valid across the rename on POSIX
+        os.replace(tmp, self.trajectory_file)
+        self._trajectory = new
+        return new
+
+    def close_trajectory(self):
+        """Flushes and releases the memory map opened by open_trajectory()."""
+        if self._trajectory is not None:
+            self._trajectory.flush()
+            self._trajectory = None
+
+
+def export_metrics_csv(columns_file: str, csv_file: str):
+    """
+    Converts a streamed metrics.bin into the metrics.csv layout, chunk by chunk.
+    
+    Works on any run directory, including runs whose process died before
+    save(): every completed chunk is exported.
+    """
+    names = [name for name, _ in METRIC_COLUMNS]
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for chunk in iter_chunks(columns_file):
+            values = [chunk[name].tolist() for name in names]
+            # NaN rule strength marks steps without an applied rule
+            values[-1] = ['' if s != s else s for s in values[-1]]
+            writer.writerows(zip(*values))
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence
+
+
+def derive_seeds(base_seed: int, n: int) -> List[int]:
+    """
+    Derives n independent integer run seeds from a base seed.
+
+    Seeds come from np.random.SeedSequence, so they depend only on
+    (base_seed, n) and never on how runs are distributed over workers.
+    """
+    state = np.random.SeedSequence(base_seed).generate_state(n, dtype=np.uint64)
+    return [int(s) for s in state]
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Maps None or values < 1 to the number of available CPUs."""
+    if workers is None or workers < 1:
+        return os.cpu_count() or 1
+    return workers
+
+
+class ProgressReporter:
+    """
+    Single-line progress counter for batches of runs.
+    """
+    def __init__(self, total: int, desc: str = "Runs", unit: str = "runs", enabled: bool = True, min_interval: float = 0.5):
+        self.total = total
+        self.desc = desc
+        self.unit = unit
+        self.enabled = enabled
+        self.min_interval = min_interval
+        self.done = 0
+        self.start = time.time()
+        self._last = 0.0
+
+    def update(self, n: int = 1):
+        self.done += n
+        now = time.time()
+        if self.enabled and (now - self._last >= self.min_interval or self.done == self.total):
+            self._last = now
+            elapsed = now - self.start
+            sys.stdout.write(f"\r  {self.desc}: {self.done}/{self.total} {self.unit} ({elapsed:.1f}s)")
+            if self.done == self.total:
+                sys.stdout.write("\n")
+            sys.stdout.flush()
+
+
+def run_tasks(
+    fn: Callable[[Any], Any],
+    tasks: Sequence[Any],
+    workers: Optional[int] = 1,
+    desc: str = "Runs",
+    unit: str = "runs",
+    progress: bool = True,
+    queue: Optional[Any] = None
+) -> List[Any]:
+    """
+    Applies fn to every task, optionally across a process pool.
+    
+    With a queue.JobQueue, tasks are recorded in its database and run by
+    JobQueue.run instead, so an interrupted sweep skips finished tasks
+    when restarted.
+
+    Args:
+        fn: Picklable top-level function taking one task
+        tasks: Task arguments
+        workers: Number of processes (1 runs inline, None uses all CPUs)
+        desc: Label for progress output
+        unit: Name of one task in progress output
+        progress: Whether to print per-run progress
+        queue: Optional JobQueue backing the tasks
+
+    Returns:
+        Results in task order, regardless of completion order
+    """
+    if queue is not None:
+        return queue.run(fn, tasks, workers=workers, desc=desc, unit=unit, progress=progress)
+        
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    reporter = ProgressReporter(len(tasks), desc=desc, unit=unit, enabled=progress)
+
+    if workers == 1:
+        results = []
+        for task in tasks:
+            results.append(fn(task))
+            reporter.update()
+        return results
+
+    results: List[Any] = [None] * len(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            reporter.update()
+    return results
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import time
+import traceback
+import numpy as np
+from typing import Any, Callable, List, Optional, Sequence
+from .parallel import ProgressReporter, resolve_workers
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    sweep TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    task BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result BLOB,
+    error TEXT,
+    pid INTEGER,
+    started REAL,
+    finished REAL,
+    PRIMARY KEY (sweep, idx)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (sweep, status, idx);
+"""
+
+
+def _fingerprint_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    root = getattr(obj, 'root', None)
+    if isinstance(root, str):
+        # e.g. a ResultCache: identified by its directory, not its counters
+        return {type(obj).__name__: root}
+    return repr(obj)
+
+
+def sweep_id(fn: Callable[[Any], Any], tasks: Sequence[Any]) -> str:
+    """Deterministic id of (fn, tasks), so rerunning a sweep finds its jobs."""
+    payload = json.dumps(
+        [f"{fn.__module__}.{fn.__qualname__}", list(tasks)],
+        default=_fingerprint_default, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """
+    Persistent SQLite job queue for sweeps on one host.
+
+    Each job is one task of a sweep, identified by (sweep id, index), with
+    its status ('pending', 'running', 'done', 'failed') and pickled
+    result. Claims happen inside BEGIN IMMEDIATE transactions, so any
+    number of worker processes (including other invocations of the same
+    script) can pull from the queue concurrently. Jobs held by processes
+    that died are returned to 'pending'; finished jobs are never rerun.
+    """
+    def __init__(self, path: str, timeout: float = 60.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross fork(); open one per process
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        return {'path': self.path, 'timeout': self.timeout}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.timeout = state['timeout']
+        self._conn = None
+
+    def submit(self, sweep: str, tasks: Sequence[Any]):
+        """Registers tasks (idempotent); failed jobs are queued again."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (sweep, idx, task) VALUES (?, ?, ?)",
+                ((sweep, i, pickle.dumps(task)) for i, task in enumerate(tasks))
+            )
+            conn.execute("UPDATE jobs SET status = 'pending', error = NULL WHERE sweep = ? AND status = 'failed'", (sweep,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.requeue_orphans(sweep)
+
+    def requeue_orphans(self, sweep: str, exited: Sequence[int] = ()) -> int:
+        """
+        Returns 'running' jobs whose process is gone to 'pending'.
+
+        Args:
+            sweep: Sweep id
+            exited: Pids of this process's own workers that have exited. An
+                    unreaped child still answers os.kill(pid, 0), so the
+                    caller reports its children; other pids are probed.
+        """
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT DISTINCT pid FROM jobs WHERE sweep = ? AND status = 'running'", (sweep,)
+        ).fetchall()
+        exited = set(exited)
+        dead = [pid for (pid,) in rows if pid in exited or not _pid_alive(pid)]
+        n = 0
+        for pid in dead:
+            n += conn.execute(
+                "UPDATE jobs SET status = 'pending', pid = NULL WHERE sweep = ? AND status = 'running' AND pid IS ?",
+                (sweep, pid)
+            ).rowcount
+        return n
+
+    def claim(self, sweep: str):
+        """Atomically takes the next pending job; returns (idx, task) or None."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT idx, task FROM jobs WHERE sweep = ? AND status = 'pending' ORDER BY idx LIMIT 1", (sweep,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', pid = ?, started = ? WHERE sweep = ? AND idx = ?",
+                    (os.getpid(), time.time(), sweep, row[0])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return None if row is None else (row[0], pickle.loads(row[1]))
+
+    def complete(self, sweep: str, idx: int, result: Any):
+        self._connect().execute(
+            "UPDATE jobs SET status = 'done', result = ?, finished = ? WHERE sweep = ? AND idx = ?",
+            (pickle.dumps(result), time.time(), sweep, idx)
+        )
+
+    def fail(self, sweep: str, idx: int, error: str):
+        self._connect().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished = ? WHERE sweep = ? AND idx = ?",
+            (error, time.time(), sweep, idx)
+        )
+
+    def counts(self, sweep: str) -> dict:
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE sweep = ? GROUP BY status", (sweep,)
+        ).fetchall()
+        return {status: n for status, n in rows}
+
+    def results(self, sweep: str) -> List[Any]:
+        """Results of a finished sweep in task order."""
+        rows = self._connect().execute(
+            "SELECT status, result FROM jobs WHERE sweep = ? ORDER BY idx", (sweep,)
+        ).fetchall()
+        if any(status != 'done' for status, _ in rows):
+            raise RuntimeError("Sweep has unfinished jobs")
+        return [pickle.loads(result) for _, result in rows]
+
+    def work(self, fn: Callable[[Any], Any], sweep: str, on_job: Optional[Callable[[], None]] = None) -> int:
+        """Runs jobs of `sweep` until none are pending; returns the number run."""
+        n = 0
+        while True:
+            job = self.claim(sweep)
+            if job is None:
+                return n
+            idx, task = job
+            try:
+                result = fn(task)
+            except Exception:
+                self.fail(sweep, idx, traceback.format_exc())
+            else:
+                self.complete(sweep, idx, result)
+            n += 1
+            if on_job is not None:
+                on_job()
+
+    def run(
+        self,
+        fn: Callable[[Any], Any],
+        tasks: Sequence[Any],
+        workers: Optional[int] = 1,
+        desc: str = "Runs",
+        unit: str = "runs",
+        progress: bool = True,
+        poll_interval: float = 0.5
+    ) -> List[Any]:
+        """
+        Queue-backed counterpart of parallel.run_tasks.
+
+        Submits the tasks under sweep_id(fn, tasks), works on them with
+        `workers` processes (plus any other process working on the same
+        sweep) and returns all results in task order. Jobs finished by an
+        earlier, interrupted invocation are not rerun.
+        """
+        sweep = sweep_id(fn, tasks)
+        self.submit(sweep, tasks)
+        done_before = self.counts(sweep).get('done', 0)
+        reporter = ProgressReporter(len(tasks), desc=desc, unit=unit, enabled=progress)
+        if done_before:
+            print(f"  {desc}: resuming, {done_before}/{len(tasks)} {unit} already done")
+            reporter.update(done_before)
+
+        workers = min(resolve_workers(workers), max(len(tasks) - done_before, 1))
+        procs = [
+            multiprocessing.Process(target=self.work, args=(fn, sweep))
+            for _ in range(workers - 1)
+        ]
+        for p in procs:
+            p.start()
+        
+        def report() -> int:
+            counts = self.counts(sweep)
+            finished = counts.get('done', 0) + counts.get('failed', 0)
+            if finished > reporter.done:
+                reporter.update(finished - reporter.done)
+            return finished
+            
+        try:
+            # The calling process is a worker too
+            self.work(fn, sweep, on_job=report)
+            while report() < len(tasks):
+                # is_alive() also reaps workers that crashed mid-job
+                exited = [p.pid for p in procs if not p.is_alive()]
+                if self.requeue_orphans(sweep, exited) or self.counts(sweep).get('pending', 0):
+                    self.work(fn, sweep, on_job=report)
+                time.sleep(poll_interval)
+        finally:
+            for p in procs:
+                p.join()
+
+        counts = self.counts(sweep)
+        if counts.get('failed'):
+            error = self._connect().execute(
+                "SELECT error FROM jobs WHERE sweep = ? AND status = 'failed' ORDER BY idx LIMIT 1", (sweep,)
+            ).fetchone()[0]
+            raise RuntimeError(f"{counts['failed']} of {len(tasks)} jobs failed; first error:\n{error}")
+        return self.results(sweep)
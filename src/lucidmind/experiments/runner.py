@@ -1,15 +1,57 @@
+import json
+import os
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from ..core.kernel import Kernel
+from ..core.ensemble import KernelEnsemble
 from .logger import ExperimentLogger
+from .parallel import derive_seeds, run_tasks
+from .cache import ResultCache
+from .catalog import RunCatalog
+from ..analysis.stability import OnlineClassifier
 
 class ExperimentRunner:
     """
     Executes simulations and handles logging.
+    
+    With streaming=True, run_single logs through a streaming
+    ExperimentLogger (metrics.bin, constant memory in T) instead of
+    metrics.csv. With a ResultCache, seeded run_metrics_only calls are
+    served from and stored in the cache.
+    
+    Every run also persists its end-of-run kernel checkpoint (checkpoint.npz
+    in the run directory, or next to the cached metrics), so extend_run and
+    resume_metrics can continue it to a longer horizon instead of starting
+    over. Because the checkpoint restores the generator state exactly, the
+    extended history is identical to a fresh run at the longer horizon.
+    
+    With config['early_stop'] set, run_metrics_only feeds every step into
+    an OnlineClassifier and stops as soon as the run is classified as
+    COLLAPSE or EXPLOSION: the class of the history so far is checked
+    every early_stop_every steps, and the run stops once the same terminal
+    class has held for early_stop_patience steps. The returned histories
+    then end at the stopping step, and classify_run assigns them the class
+    that stopped the run.
+    
+    With config['profile'] set, the kernel's per-phase timings are returned
+    under metrics['profile'] and written to profile.json in run directories.
+    
+    With catalog=True, every finished or extended run directory is recorded
+    in the RunCatalog of its output root (see experiments/catalog.py).
     """
-    def __init__(self, config: Dict[str, Any], output_root: str = "experiments/results"):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        output_root: str = "experiments/results",
+        streaming: bool = False,
+        cache: Optional[ResultCache] = None,
+        catalog: bool = True
+    ):
         self.config = config
         self.output_root = output_root
+        self.streaming = streaming
+        self.cache = cache
+        self.catalog = catalog
 
     def run_single(self, seed: Optional[int] = None) -> str:
         """
@@ -20,55 +62,286 @@ class ExperimentRunner:
         """
         rng = np.random.default_rng(seed)
         kernel = Kernel(self.config, rng=rng)
-        logger = ExperimentLogger(self.output_root)
+        logger = ExperimentLogger(self.output_root, streaming=self.streaming)
         
         logger.log_config({**self.config, 'seed': seed})
         
-        trajectory = []
         T = self.config.get('T', 3000)
+        trajectory = logger.open_trajectory(T, kernel.N)
+        self._run_logged(kernel, logger, trajectory, T)
+        self._catalog(logger)
         
-        for t in range(1, T + 1):
-            step_result = kernel.step()
-            logger.log_step(step_result)
-            trajectory.append(step_result['state'])
+        return logger.run_dir
+
+    def extend_run(self, run_dir: str, T: int) -> str:
+        """
+        Continues a run_single directory from its checkpoint up to horizon T.
+        
+        Metrics (metrics.csv or metrics.bin) and trajectory.npy are appended
+        in place and config.json records the new T. The kernel config comes
+        from the checkpoint, not from this runner.
+        
+        Returns:
+            run_dir
+        """
+        streaming = os.path.exists(os.path.join(run_dir, "metrics.bin"))
+        logger = ExperimentLogger(os.path.dirname(os.path.normpath(run_dir)), streaming=streaming, run_dir=run_dir)
+        kernel = Kernel.load_checkpoint(logger.checkpoint_file)
+        if T <= kernel.t:
+            raise ValueError(f"Run already has {kernel.t} steps (requested T={T})")
             
-        logger.save()
-        logger.save_trajectory(trajectory)
+        with open(logger.config_file) as f:
+            logged = json.load(f)
+        logger.log_config({**logged, 'T': T})
         
-        return logger.run_dir
+        trajectory = logger.extend_trajectory(T, kernel.N)
+        self._run_logged(kernel, logger, trajectory, T)
+        self._catalog(logger)
+        
+        return run_dir
+
+    def _catalog(self, logger: ExperimentLogger):
+        """Records a finished run directory in its output root's catalog."""
+        if not self.catalog:
+            return
+        catalog = RunCatalog(logger.output_dir)
+        try:
+            catalog.record(logger.run_dir)
+        finally:
+            catalog.close()
 
-    def run_batch(self, n_runs: int, seed_start: int = 42):
+    def _run_logged(self, kernel: Kernel, logger: ExperimentLogger, trajectory: np.ndarray, T: int):
+        """Steps kernel from kernel.t to T through the logger, then checkpoints it."""
+        # Streaming runs reuse one chunk of metric buffers; otherwise one pass
+        chunk = logger.chunk_size if logger.streaming else T - kernel.t
+        buffers = {
+            'complexity': np.zeros(chunk, dtype=int),
+            'entropy': np.zeros(chunk),
+            'n_rules': np.zeros(chunk, dtype=int),
+            'gain': np.zeros(chunk, dtype=int),
+            'born': np.zeros(chunk, dtype=int),
+            'died': np.zeros(chunk, dtype=int),
+            'rule_strength': np.zeros(chunk)
+        }
+        
+        done = kernel.t
+        while done < T:
+            n = min(chunk, T - done)
+            out = {k: v[:n] for k, v in buffers.items()}
+            out['state'] = trajectory[done:done + n]
+            kernel.run(n, out=out)
+            logger.log_steps(out, start_step=done + 1)
+            done += n
+            
+        logger.save()
+        logger.close_trajectory()
+        kernel.save_checkpoint(logger.checkpoint_file)
+        if kernel.profiler is not None:
+            with open(os.path.join(logger.run_dir, "profile.json"), 'w') as f:
+                json.dump(kernel.profiler.summary(), f, indent=2)
+
+    def run_batch(self, n_runs: int, seed_start: int = 42, workers: Optional[int] = 1) -> List[str]:
         """
-        Runs a batch of experiments with sequential seeds.
+        Runs a batch of experiments with seeds derived from seed_start.
+        
+        Args:
+            n_runs: Number of runs
+            seed_start: Base seed; run seeds come from derive_seeds(seed_start, n_runs)
+            workers: Number of worker processes (None uses all CPUs)
+            
+        Returns:
+            Run directories in seed order
         """
         print(f"Starting batch experiment: {n_runs} runs, seed_start={seed_start}")
-        for i in range(n_runs):
-            seed = seed_start + i
-            run_dir = self.run_single(seed=seed)
-            print(f"  Run {i+1}/{n_runs} complete: {run_dir}")
+        seeds = derive_seeds(seed_start, n_runs)
+        tasks = [(self.config, self.output_root, self.streaming, seed, self.catalog) for seed in seeds]
+        return run_tasks(run_single_task, tasks, workers=workers, desc="Batch")
 
     def run_metrics_only(self, seed: Optional[int] = None) -> Dict[str, Any]:
         """
-        Runs a simulation and returns final aggregated metrics without disk IO.
+        Runs a simulation and returns final aggregated metrics.
+        
+        No run directory is written; only the result cache (if any) is touched.
+        On a cache miss, a cached shorter run of the same config and seed is
+        extended (see resume_metrics) rather than recomputed from step 0.
+        Profiled runs always execute (their timings are not cached), and an
+        entry cut short by early_stop only satisfies early_stop requests.
         """
+        T = self.config.get('T', 1000)
+        cacheable = self.cache is not None and seed is not None
+        if cacheable and not self.config.get('profile', False):
+            cached = self.cache.get(self.config, seed, T)
+            if cached is not None and (len(cached['complexity_history']) >= T or self.config.get('early_stop', False)):
+                return cached
+            resumed = self.resume_metrics(seed, T)
+            if resumed is not None:
+                return resumed
+                
         rng = np.random.default_rng(seed)
         kernel = Kernel(self.config, rng=rng)
+        metrics = self._metrics_from(kernel, T, {'complexity_history': [], 'entropy_history': []})
+        if cacheable:
+            self.cache.put(self.config, seed, T, metrics)
+            self.cache.put_checkpoint(self.config, seed, T, kernel)
+        return metrics
+
+    def resume_metrics(self, seed: int, T: int) -> Optional[Dict[str, Any]]:
+        """
+        Extends the longest cached shorter run of (config, seed) to horizon T.
         
-        comp_hist = []
-        ent_hist = []
-        T = self.config.get('T', 1000)
+        Loads that run's end-of-run checkpoint, steps the remaining T - T0
+        steps and appends them to its cached histories. The result (stored
+        in the cache with its own checkpoint) equals a fresh T-step run.
+        
+        Returns:
+            Metrics dict as from run_metrics_only, or None if the cache holds
+            no shorter run to resume
+        """
+        if self.cache is None:
+            raise ValueError("resume_metrics needs a ResultCache")
+        found = self.cache.latest_checkpoint(self.config, seed, T)
+        if found is None:
+            return None
+            
+        T0, kernel, prefix = found
+        if kernel.t < T0 and self.config.get('early_stop', False):
+            # Stopped early: the class was decided, a longer horizon changes nothing
+            metrics = prefix
+        else:
+            metrics = self._metrics_from(kernel, T, prefix)
+        self.cache.put(self.config, seed, T, metrics)
+        self.cache.put_checkpoint(self.config, seed, T, kernel)
+        return metrics
+
+    def _metrics_from(self, kernel: Kernel, T: int, prefix: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs kernel from kernel.t to T (or an early stop) and appends the histories to prefix's."""
+        complexity = list(prefix['complexity_history'])
+        entropy = list(prefix['entropy_history'])
+        
+        if self.config.get('early_stop', False):
+            classifier = OnlineClassifier()
+            classifier.update_many(complexity, entropy)
+            every = self.config.get('early_stop_every', 25)
+            patience = self.config.get('early_stop_patience', 200)
+            label, since = None, kernel.t
+        else:
+            classifier = None
+            every = T - kernel.t
+        out = {
+            'complexity': np.zeros(every, dtype=int),
+            'entropy': np.zeros(every)
+        }
         
-        for t in range(T):
-            res = kernel.step()
-            comp_hist.append(res['complexity'])
-            ent_hist.append(res['entropy'])
+        while kernel.t < T:
+            n = min(every, T - kernel.t)
+            block = {k: v[:n] for k, v in out.items()}
+            kernel.run(n, out=block)
+            c, e = block['complexity'].tolist(), block['entropy'].tolist()
+            complexity += c
+            entropy += e
+            if classifier is not None:
+                classifier.update_many(c, e)
+                stats = kernel.get_stats()
+                decided = classifier.decided(stats['damping_ratio'], stats['born_total'])
+                if decided != label:
+                    label, since = decided, kernel.t
+                elif label is not None and kernel.t - since >= patience:
+                    break
             
         stats = kernel.get_stats()
         
-        return {
-            'complexity_history': comp_hist,
-            'entropy_history': ent_hist,
+        metrics = {
+            'complexity_history': complexity,
+            'entropy_history': entropy,
             'damping_ratio': stats['damping_ratio'],
             'born_total': stats['born_total'],
             'alive_count': stats['alive_count']
         }
+        if stats['profile'] is not None:
+            metrics['profile'] = stats['profile']
+        return metrics
+
+    def run_metrics_batch(
+        self,
+        seeds: List[int],
+        workers: Optional[int] = 1,
+        desc: str = "Runs",
+        progress: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs run_metrics_only for every seed, optionally across a process pool.
+        
+        Returns:
+            One metrics dict per seed, in seed order
+        """
+        tasks = [(self.config, seed, self.cache) for seed in seeds]
+        return run_tasks(run_metrics_task, tasks, workers=workers, desc=desc, progress=progress)
+
+    def run_metrics_ensemble(
+        self,
+        seeds: List[int],
+        overrides: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs len(seeds) simulations in lockstep with a KernelEnsemble.
+        
+        Args:
+            seeds: One seed per member; together they seed the shared generator
+            overrides: Optional per-member config overrides (e.g. swept parameters)
+            
+        Returns:
+            One metrics dict per member, laid out like run_metrics_only
+        """
+        if overrides is None:
+            overrides = [{}] * len(seeds)
+        if len(overrides) != len(seeds):
+            raise ValueError("overrides must have one entry per seed")
+            
+        configs = [{**self.config, **o} for o in overrides]
+        rng = np.random.default_rng(list(seeds))
+        ensemble = KernelEnsemble(configs, rng=rng)
+        T = self.config.get('T', 1000)
+        
+        return ensemble.run_metrics(T)
+
+
+def run_single_task(task) -> str:
+    """Process-pool entry point for run_single."""
+    config, output_root, streaming, seed, catalog = task
+    return ExperimentRunner(config, output_root, streaming=streaming, catalog=catalog).run_single(seed=seed)
+
+
+def run_metrics_task(task) -> Dict[str, Any]:
+    """Process-pool entry point for run_metrics_only."""
+    config, seed, cache = task
+    return ExperimentRunner(config, cache=cache).run_metrics_only(seed=seed)
+
+
+def run_metrics_resume_task(task) -> Tuple[Dict[str, Any], Optional[Tuple]]:
+    """
+    Process-pool entry point that runs or continues a run to config['T'].
+    
+    task is (config, seed, cache, state), where state is None for a new run
+    or the state returned by a shorter call. With a cache, run_metrics_only
+    resumes from its stored checkpoint instead and no state is passed around.
+    
+    Returns:
+        (metrics, state for the next call, or None when a cache is used)
+    """
+    config, seed, cache, state = task
+    runner = ExperimentRunner(config, cache=cache)
+    if cache is not None:
+        return runner.run_metrics_only(seed=seed), None
+        
+    T = config.get('T', 1000)
+    if state is None:
+        kernel = Kernel(config, rng=np.random.default_rng(seed))
+        metrics = runner._metrics_from(kernel, T, {'complexity_history': [], 'entropy_history': []})
+    else:
+        snap, prefix, T_prev = state
+        kernel = Kernel.from_snapshot(snap, config=config)
+        if kernel.t < T_prev:
+            # Stopped early: the class was decided, a longer horizon changes nothing
+            return prefix, state
+        metrics = runner._metrics_from(kernel, T, prefix)
+    return metrics, (kernel.snapshot(), metrics, T)
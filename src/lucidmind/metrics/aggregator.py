@@ -1,5 +1,7 @@
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+
+PERCENTILES = (5, 25, 50, 75, 95)
 
 def aggregate_metrics(all_run_metrics: List[Dict[str, np.ndarray]]) -> Dict[str, Dict[str, np.ndarray]]:
     """
@@ -24,14 +26,17 @@ def aggregate_metrics(all_run_metrics: List[Dict[str, np.ndarray]]) -> Dict[str,
         # Stack all runs for this metric: (n_runs, T)
         data = np.stack([run[name] for run in all_run_metrics if name in run])
         
+        # One partition for all five percentiles
+        p5, p25, p50, p75, p95 = np.percentile(data, PERCENTILES, axis=0)
+        
         aggregated[name] = {
             'mean': np.mean(data, axis=0),
             'std': np.std(data, axis=0),
-            'p5': np.percentile(data, 5, axis=0),
-            'p25': np.percentile(data, 25, axis=0),
-            'p50': np.percentile(data, 50, axis=0),
-            'p75': np.percentile(data, 75, axis=0),
-            'p95': np.percentile(data, 95, axis=0)
+            'p5': p5,
+            'p25': p25,
+            'p50': p50,
+            'p75': p75,
+            'p95': p95
         }
         
     return aggregated
@@ -49,3 +54,199 @@ def find_stability_window(aggregated_complexity: Dict[str, np.ndarray]) -> Dict[
         'c_max_stable': float(np.max(p95)),
         'c_avg_stable': float(np.mean(mean_comp))
     }
+
+class QuantileSketch:
+    """
+    Mergeable per-timestep quantile sketch of a stream of 1D series.
+    
+    Series are added one at a time and may differ in length: timestep t
+    summarizes the series that reached t. Every timestep keeps exact
+    count/mean/M2 accumulators (Welford, merged with Chan's formula) and a
+    compactor sketch: level l holds up to k items of weight 2**l, and a
+    full level is sorted and every other item (random offset) promoted to
+    level l + 1. All timesteps are processed together as (T, k) arrays.
+    
+    Memory is O(T * k * log2(n / k)) for n series. With at most k series
+    quantiles equal np.percentile exactly; each compaction at level l
+    shifts ranks by at most 2**l, and rank_error() reports the resulting
+    worst-case bound.
+    """
+    def __init__(self, k: int = 128, rng: Optional[np.random.Generator] = None):
+        self.k = max(2, k - k % 2)
+        self.rng = rng if rng is not None else np.random.default_rng(0)
+        self.T = 0
+        self.count = np.zeros(0, dtype=int)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.error = np.zeros(0)
+        self.levels: List[np.ndarray] = []
+        self.fill: List[np.ndarray] = []
+
+    def _ensure_length(self, T: int):
+        if T <= self.T:
+            return
+        cap = len(self.count)
+        if T > cap:
+            new_cap = max(T, 2 * cap)
+            pad = new_cap - cap
+            self.count = np.concatenate([self.count, np.zeros(pad, dtype=int)])
+            self.mean = np.concatenate([self.mean, np.zeros(pad)])
+            self.m2 = np.concatenate([self.m2, np.zeros(pad)])
+            self.error = np.concatenate([self.error, np.zeros(pad)])
+            self.levels = [np.concatenate([buf, np.zeros((pad, self.k))]) for buf in self.levels]
+            self.fill = [np.concatenate([f, np.zeros(pad, dtype=int)]) for f in self.fill]
+        self.T = T
+
+    def _push(self, level: int, values: np.ndarray, rows: np.ndarray):
+        """Inserts one value per row into a level, compacting rows that fill up."""
+        # A merged-in sketch can be deeper than this one: add every missing level
+        while level >= len(self.levels):
+            cap = len(self.count)
+            self.levels.append(np.zeros((cap, self.k)))
+            self.fill.append(np.zeros(cap, dtype=int))
+        buf, fill = self.levels[level], self.fill[level]
+        buf[rows, fill[rows]] = values
+        fill[rows] += 1
+        full = rows[fill[rows] == self.k]
+        if len(full):
+            self._compact(level, full)
+
+    def _compact(self, level: int, rows: np.ndarray):
+        items = np.sort(self.levels[level][rows], axis=1)
+        offset = self.rng.integers(0, 2, size=len(rows))
+        kept = np.take_along_axis(items, offset[:, np.newaxis] + 2 * np.arange(self.k // 2), axis=1)
+        self.fill[level][rows] = 0
+        self.error[rows] += 2 ** level
+        for j in range(self.k // 2):
+            self._push(level + 1, kept[:, j], rows)
+
+    def add(self, values: Sequence[float]):
+        """Adds one series (its length may differ from earlier ones)."""
+        x = np.asarray(values, dtype=float)
+        L = len(x)
+        if L == 0:
+            return
+        self._ensure_length(L)
+        self.count[:L] += 1
+        delta = x - self.mean[:L]
+        self.mean[:L] += delta / self.count[:L]
+        self.m2[:L] += delta * (x - self.mean[:L])
+        self._push(0, x, np.arange(L))
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Folds another sketch (e.g. from another worker) into this one."""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+        self._ensure_length(other.T)
+        T = other.T
+        n_a, n_b = self.count[:T], other.count[:T]
+        n = n_a + n_b
+        safe = np.maximum(n, 1)
+        delta = other.mean[:T] - self.mean[:T]
+        self.mean[:T] += delta * n_b / safe
+        self.m2[:T] += other.m2[:T] + delta ** 2 * n_a * n_b / safe
+        self.count[:T] = n
+        self.error[:T] += other.error[:T]
+        
+        for level, (buf, fill) in enumerate(zip(other.levels, other.fill)):
+            for j in range(int(fill[:T].max(initial=0))):
+                rows = np.flatnonzero(fill[:T] > j)
+                self._push(level, buf[rows, j], rows)
+        return self
+
+    def std(self) -> np.ndarray:
+        """Population standard deviation per timestep (as np.std)."""
+        T = self.T
+        return np.sqrt(self.m2[:T] / np.maximum(self.count[:T], 1))
+
+    def rank_error(self) -> np.ndarray:
+        """Worst-case rank error of quantile() per timestep, as a fraction of count."""
+        T = self.T
+        return self.error[:T] / np.maximum(self.count[:T], 1)
+
+    def quantile(self, percentiles: Sequence[float]) -> np.ndarray:
+        """
+        Percentiles per timestep, shape (len(percentiles), T).
+        
+        Uses np.percentile's linear interpolation on the weighted items;
+        timesteps without data are NaN.
+        """
+        T = self.T
+        if T == 0:
+            return np.zeros((len(percentiles), 0))
+        slots = np.arange(self.k)
+        values = np.concatenate([buf[:T] for buf in self.levels], axis=1)
+        weights = np.concatenate(
+            [np.where(slots < fill[:T, np.newaxis], 2 ** level, 0) for level, fill in enumerate(self.fill)], axis=1
+        )
+        values = np.where(weights > 0, values, np.inf)
+        order = np.argsort(values, axis=1, kind='stable')
+        values = np.take_along_axis(values, order, axis=1)
+        cum = np.cumsum(np.take_along_axis(weights, order, axis=1), axis=1)
+        
+        n = self.count[:T]
+        out = np.full((len(percentiles), T), np.nan)
+        has = n > 0
+        last = values.shape[1] - 1
+        for i, q in enumerate(percentiles):
+            h = q / 100.0 * (n - 1)
+            lo = np.floor(h)
+            hi = np.minimum(lo + 1, n - 1)
+            # Item holding rank r: the number of items whose cumulative weight is <= r
+            i_lo = np.minimum(np.sum(cum <= lo[:, np.newaxis], axis=1), last)
+            i_hi = np.minimum(np.sum(cum <= hi[:, np.newaxis], axis=1), last)
+            v_lo = values[np.arange(T), i_lo]
+            v_hi = values[np.arange(T), i_hi]
+            with np.errstate(invalid='ignore'):
+                out[i, has] = (v_lo + (h - lo) * (v_hi - v_lo))[has]
+        return out
+
+
+class StreamingAggregator:
+    """
+    Streaming, mergeable counterpart of aggregate_metrics.
+    
+    Runs are added one at a time (see add) and may have different lengths,
+    e.g. early-stopped runs; aggregators built by separate workers or
+    shards combine with merge. Memory does not grow with the number of
+    runs beyond the log2(n / k) levels of each QuantileSketch.
+    """
+    def __init__(self, k: int = 128, seed: int = 0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.n_runs = 0
+
+    def add(self, run_metrics: Dict[str, Sequence[float]]):
+        """Adds one run: metric name -> 1D array of values over time."""
+        for name, values in run_metrics.items():
+            if name not in self.sketches:
+                self.sketches[name] = QuantileSketch(self.k, rng=self.rng)
+            self.sketches[name].add(values)
+        self.n_runs += 1
+
+    def merge(self, other: 'StreamingAggregator') -> 'StreamingAggregator':
+        for name, sketch in other.sketches.items():
+            if name not in self.sketches:
+                self.sketches[name] = QuantileSketch(self.k, rng=self.rng)
+            self.sketches[name].merge(sketch)
+        self.n_runs += other.n_runs
+        return self
+
+    def result(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Same layout as aggregate_metrics, plus per-timestep 'count' (runs
+        reaching t) and 'rank_error' (worst-case quantile rank error).
+        """
+        aggregated = {}
+        for name, sketch in self.sketches.items():
+            stats = {
+                'mean': sketch.mean[:sketch.T].copy(),
+                'std': sketch.std()
+            }
+            for q, values in zip(PERCENTILES, sketch.quantile(PERCENTILES)):
+                stats[f'p{q}'] = values
+            stats['count'] = sketch.count[:sketch.T].copy()
+            stats['rank_error'] = sketch.rank_error()
+            aggregated[name] = stats
+        return aggregated
@@ -0,0 +1,126 @@
+import math
+
+
+class RollingGrowthDetector:
+    """
+    Streaming version of detect_unbounded_growth (Condition E1).
+
+    Keeps running sums of y = log(c + 1e-6) and x * y over the last
+    min_window values, so the least-squares slope and r^2 of the current
+    window are available in O(1) per step.
+
+    See: docs/math_core.md#531-condition-e1-unbounded-growth
+    """
+    def __init__(self, min_window: int = 50, slope_threshold: float = 0.1, r2_threshold: float = 0.9):
+        self.min_window = min_window
+        self.slope_threshold = slope_threshold
+        self.r2_threshold = r2_threshold
+        self._window = [0.0] * min_window
+        self._pos = 0
+        self.n = 0
+        # Sums over the window with x = 0 for the oldest value
+        self._sy = 0.0
+        self._syy = 0.0
+        self._sxy = 0.0
+        w = float(min_window)
+        self._sx = w * (w - 1) / 2
+        self._sxx = (w - 1) * w * (2 * w - 1) / 6
+
+    def update(self, complexity: float):
+        y = math.log(complexity + 1e-6)
+        w = self.min_window
+        if self.n >= w:
+            # Drop the oldest value, then shift every x down by one
+            old = self._window[self._pos]
+            self._sy -= old
+            self._syy -= old * old
+            self._sxy -= self._sy
+            x = w - 1
+        else:
+            x = self.n
+        self._window[self._pos] = y
+        self._pos = (self._pos + 1) % w
+        self._sy += y
+        self._syy += y * y
+        self._sxy += x * y
+        self.n += 1
+
+    def fit(self):
+        """Returns (slope, r^2) of the current window, or (0.0, 0.0) if it is not full."""
+        if self.n < self.min_window:
+            return 0.0, 0.0
+        w = self.min_window
+        sxy = w * self._sxy - self._sx * self._sy
+        sxx = w * self._sxx - self._sx * self._sx
+        syy = w * self._syy - self._sy * self._sy
+        slope = sxy / sxx
+        # A constant window has no correlation (as in scipy.stats.linregress)
+        r2 = sxy * sxy / (sxx * syy) if syy > 1e-10 * w * abs(self._syy) else 0.0
+        return slope, r2
+
+    @property
+    def triggered(self) -> bool:
+        slope, r2 = self.fit()
+        return slope > self.slope_threshold and r2 > self.r2_threshold
+
+
+class WelfordAccumulator:
+    """
+    Running mean and population variance (Welford's algorithm).
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+
+    @property
+    def var(self) -> float:
+        return self._m2 / self.n if self.n else 0.0
+
+
+class EntropyLockDetector:
+    """
+    Streaming version of detect_entropy_lock (Condition E2) over the whole history.
+    """
+    def __init__(self, threshold: float = 0.5, epsilon: float = 0.01, min_length: int = 10):
+        self.threshold = threshold
+        self.epsilon = epsilon
+        self.min_length = min_length
+        self.stats = WelfordAccumulator()
+
+    def update(self, entropy: float):
+        self.stats.update(entropy)
+
+    @property
+    def triggered(self) -> bool:
+        if self.stats.n < self.min_length:
+            return False
+        return self.stats.mean > self.threshold and self.stats.var < self.epsilon
+
+
+class RunLengthCounter:
+    """
+    Tracks the current and longest run of consecutive True flags.
+
+    Used for collapse (complexity below c_min for t_min_consecutive steps).
+
+    See: docs/math_core.md#54-collapse-detection
+    """
+    def __init__(self):
+        self.current = 0
+        self.longest = 0
+
+    def update(self, flag: bool):
+        if flag:
+            self.current += 1
+            if self.current > self.longest:
+                self.longest = self.current
+        else:
+            self.current = 0
+
@@ -1,45 +1,186 @@
 import numpy as np
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Union
+from scipy import stats
 
-def compute_pairwise_distances(trajectories: List[np.ndarray]) -> np.ndarray:
+def load_trajectory(path: str, mmap: bool = True) -> np.ndarray:
+    """
+    Loads a (T, N) trajectory.npy, memory-mapped read-only by default.
+    
+    Slicing a memory-mapped trajectory only reads the touched rows, so the
+    functions below can process trajectories larger than RAM.
+    """
+    return np.load(path, mmap_mode='r' if mmap else None)
+
+def _as_trajectories(trajectories: Sequence[Union[str, np.ndarray]]) -> List[np.ndarray]:
+    """Opens trajectory.npy paths memory-mapped; arrays pass through."""
+    return [load_trajectory(t) if isinstance(t, str) else t for t in trajectories]
+
+def _chunk_rows(chunk_size: int, bytes_per_row: int, max_bytes: int) -> int:
+    return max(1, min(chunk_size, max_bytes // max(bytes_per_row, 1)))
+
+# Pairs with |a - b|^2 below this fraction of |a|^2 + |b|^2 lose too many
+# digits to the Gram identity's cancellation and are recomputed exactly
+_GRAM_RTOL = 1e-6
+
+def compute_pairwise_distances(
+    trajectories: Sequence[Union[str, np.ndarray]],
+    chunk_size: int = 256,
+    max_bytes: int = 64 * 2**20
+) -> np.ndarray:
     """
     Computes L2 distance between all pairs of trajectories at each timestep.
     
+    Works on blocks of timesteps: per block, the squared distances of all
+    pairs come from the Gram identity |a - b|^2 = |a|^2 + |b|^2 - 2 a.b as
+    one batched (R, N) x (N, R) product per step, instead of an (R, R, N)
+    difference tensor. States are centered on their per-step mean first,
+    and the few pairs still close enough for cancellation to matter
+    (|a - b|^2 < 1e-6 (|a|^2 + |b|^2)) are recomputed as difference norms,
+    so near-identical trajectories (e.g. perturbation ensembles) keep full
+    precision. Blocks are sized so the (steps, R, R) intermediates
+    stay within max_bytes, and only one block of each trajectory is read at
+    a time, so memory-mapped trajectories never have to fit in RAM.
+    
     See: docs/math_core.md#72-trajectory-diversity
     
     Args:
-        trajectories: List of (T, N) arrays
+        trajectories: List of (T, N) arrays (e.g. from load_trajectory) or
+                      paths of trajectory.npy files
+        chunk_size: Maximum timesteps per block
+        max_bytes: Memory budget of one block's intermediates
         
     Returns:
         Array of shape (T,) with mean pairwise distance
     """
     if len(trajectories) < 2:
         return np.zeros(0)
+    trajectories = _as_trajectories(trajectories)
         
     n_runs = len(trajectories)
     T = trajectories[0].shape[0]
+    total_pairs = n_runs * (n_runs - 1) / 2
+    diag = np.arange(n_runs)
+    step = _chunk_rows(chunk_size, 4 * n_runs * n_runs * 8, max_bytes)
     
     avg_distances = np.zeros(T)
     
-    for t in range(T):
-        states = np.stack([traj[t] for traj in trajectories]) # (n_runs, N)
+    for start in range(0, T, step):
+        end = min(start + step, T)
+        X = np.stack([np.asarray(traj[start:end], dtype=float) for traj in trajectories], axis=1) # (c, n_runs, N)
+        X -= X.mean(axis=1, keepdims=True)
+        sq = np.einsum('crn,crn->cr', X, X)
+        
+        d2 = X @ X.transpose(0, 2, 1)
+        d2 *= -2.0
+        d2 += sq[:, :, np.newaxis]
+        d2 += sq[:, np.newaxis, :]
         
-        # Vectorized pairwise L2 distance
-        diff = states[:, np.newaxis, :] - states[np.newaxis, :, :]
-        dist = np.sqrt(np.sum(diff**2, axis=-1))
+        close = d2 < _GRAM_RTOL * (sq[:, :, np.newaxis] + sq[:, np.newaxis, :])
+        c, i, j = np.nonzero(close)
+        upper = i < j
+        c, i, j = c[upper], i[upper], j[upper]
+        if len(c):
+            diff = X[c, i] - X[c, j]
+            exact = np.einsum('kn,kn->k', diff, diff)
+            d2[c, i, j] = exact
+            d2[c, j, i] = exact
+        # Rounding can leave tiny negatives (and a non-zero diagonal)
+        np.maximum(d2, 0.0, out=d2)
+        d2[:, diag, diag] = 0.0
         
-        # Average of upper triangle
-        total_pairs = n_runs * (n_runs - 1) / 2
-        avg_distances[t] = np.sum(np.triu(dist, k=1)) / total_pairs
+        # Each pair appears twice in the symmetric matrix
+        avg_distances[start:end] = np.sum(np.sqrt(d2, out=d2), axis=(1, 2)) / (2 * total_pairs)
         
     return avg_distances
 
-def compute_trajectory_diversity(trajectories: List[np.ndarray]) -> float:
+def estimate_pairwise_distances(
+    trajectories: Sequence[Union[str, np.ndarray]],
+    n_pairs: int = 1000,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
+    chunk_size: int = 256,
+    max_bytes: int = 64 * 2**20
+) -> Dict[str, Any]:
+    """
+    Estimates compute_pairwise_distances from a random subset of pairs.
+    
+    n_pairs distinct pairs are drawn uniformly without replacement and
+    their distances computed exactly, so the cost scales with n_pairs
+    instead of R^2. Error bounds are normal-approximation intervals of the
+    sample mean with the finite-population correction (zero width when all
+    pairs are sampled).
+    
+    Args:
+        trajectories: List of (T, N) arrays or trajectory.npy paths
+        n_pairs: Number of pairs to sample (capped at R(R-1)/2)
+        confidence: Coverage of the returned intervals
+        rng: Generator for the pair sample
+        chunk_size: Maximum timesteps per block
+        max_bytes: Memory budget of one block's intermediates
+        
+    Returns:
+        Dict with 'distances' (T,) estimated mean pairwise distance and its
+        'stderr' (T,); 'diversity' (time average) with 'diversity_stderr'
+        and 'diversity_interval'; 'n_pairs' and 'total_pairs'
+    """
+    trajectories = _as_trajectories(trajectories)
+    n_runs = len(trajectories)
+    if n_runs < 2:
+        raise ValueError("Need at least two trajectories")
+    rng = rng if rng is not None else np.random.default_rng()
+    
+    first, second = np.triu_indices(n_runs, k=1)
+    total_pairs = len(first)
+    m = min(int(n_pairs), total_pairs)
+    picked = np.sort(rng.choice(total_pairs, size=m, replace=False))
+    first, second = first[picked], second[picked]
+    
+    # Only the runs taking part in a sampled pair are read
+    runs, inverse = np.unique(np.concatenate([first, second]), return_inverse=True)
+    a, b = inverse[:m], inverse[m:]
+    
+    T, N = trajectories[0].shape
+    step = _chunk_rows(chunk_size, (len(runs) + m) * N * 8, max_bytes)
+    pair_dist = np.zeros((m, T))
+    for start in range(0, T, step):
+        end = min(start + step, T)
+        X = np.stack([np.asarray(trajectories[r][start:end], dtype=float) for r in runs], axis=0) # (n, c, N)
+        pair_dist[:, start:end] = np.linalg.norm(X[a] - X[b], axis=-1)
+        
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    fpc = np.sqrt((total_pairs - m) / (total_pairs - 1)) if total_pairs > 1 else 0.0
+    ddof = 1 if m > 1 else 0
+    
+    stderr = pair_dist.std(axis=0, ddof=ddof) / np.sqrt(m) * fpc
+    per_pair = pair_dist.mean(axis=1)
+    diversity = float(per_pair.mean())
+    diversity_stderr = float(per_pair.std(ddof=ddof) / np.sqrt(m) * fpc)
+    
+    return {
+        'distances': pair_dist.mean(axis=0),
+        'stderr': stderr,
+        'diversity': diversity,
+        'diversity_stderr': diversity_stderr,
+        'diversity_interval': (float(diversity - z * diversity_stderr), float(diversity + z * diversity_stderr)),
+        'n_pairs': m,
+        'total_pairs': total_pairs
+    }
+
+def compute_trajectory_diversity(
+    trajectories: Sequence[Union[str, np.ndarray]],
+    n_pairs: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> float:
     """
     Computes overall diversity as average pairwise distance over time.
+    
+    With n_pairs set, the average is estimated from that many sampled
+    pairs (see estimate_pairwise_distances).
     """
     if not trajectories:
         return 0.0
+    if n_pairs is not None and len(trajectories) >= 2:
+        return estimate_pairwise_distances(trajectories, n_pairs=n_pairs, rng=rng)['diversity']
     
     avg_over_time = compute_pairwise_distances(trajectories)
     return float(np.mean(avg_over_time))
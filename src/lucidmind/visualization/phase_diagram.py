@@ -8,6 +8,9 @@ def plot_phase_diagram(
 ):
     """
     Plots a 2D phase diagram from sweep results.
+    
+    Results of PhaseAnalyzer.sweep_adaptive are drawn cell by cell, so the
+    refined regions along phase boundaries show their finer resolution.
     """
     grid = np.array(sweep_results['grid'])
     range1 = sweep_results['range1']
@@ -23,14 +26,25 @@ def plot_phase_diagram(
     colors = ['#2ca02c', '#d62728', '#1f77b4', '#ff7f0e']
     cmap = ListedColormap(colors)
     
-    im = plt.imshow(
-        grid.T, 
-        origin='lower', 
-        extent=[min(range1), max(range1), min(range2), max(range2)],
-        aspect='auto',
-        cmap=cmap,
-        vmin=0, vmax=3
-    )
+    if 'cells' in sweep_results:
+        from matplotlib.patches import Rectangle
+        ax = plt.gca()
+        for x0, x1, y0, y1, cls in sweep_results['cells']:
+            ax.add_patch(Rectangle(
+                (x0, y0), x1 - x0, y1 - y0,
+                facecolor=colors[cls], edgecolor='white', linewidth=0.3
+            ))
+        ax.set_xlim(min(range1), max(range1))
+        ax.set_ylim(min(range2), max(range2))
+    else:
+        im = plt.imshow(
+            grid.T, 
+            origin='lower', 
+            extent=[min(range1), max(range1), min(range2), max(range2)],
+            aspect='auto',
+            cmap=cmap,
+            vmin=0, vmax=3
+        )
     
     plt.xlabel(param1)
     plt.ylabel(param2)
@@ -52,3 +52,48 @@ def plot_rule_strengths(
         plt.savefig(save_path)
     else:
         plt.show()
+
+def plot_survival_curve(
+    survival: Dict[str, Any],
+    save_path: Optional[str] = None
+):
+    """
+    Plots a Kaplan-Meier curve (analysis.survival.kaplan_meier output).
+    """
+    time = np.concatenate([[0], survival['time']])
+    plt.figure(figsize=(10, 6))
+    plt.step(time, np.concatenate([[1.0], survival['survival']]), where='post', color='purple')
+    plt.fill_between(
+        time, np.concatenate([[1.0], survival['lower']]), np.concatenate([[1.0], survival['upper']]),
+        step='post', color='purple', alpha=0.2
+    )
+    plt.xlabel("Lifespan (timesteps)")
+    plt.ylabel("Survival probability")
+    plt.title(f"Rule Survival ({survival['n_rules']} rules, {survival['n_censored']} censored)")
+    plt.ylim(0, 1.05)
+    plt.grid(True, alpha=0.1)
+    
+    if save_path:
+        plt.savefig(save_path)
+    else:
+        plt.show()
+
+def plot_hazard_by_birth(
+    hazard: Dict[str, Any],
+    save_path: Optional[str] = None
+):
+    """
+    Plots death hazard per birth-time bin (analysis.survival.hazard_by_birth_time output).
+    """
+    edges = hazard['edges']
+    plt.figure(figsize=(10, 6))
+    plt.bar(edges[:-1], hazard['hazard'], width=np.diff(edges), align='edge', color='green', alpha=0.7)
+    plt.xlabel("Birth time (timestep)")
+    plt.ylabel("Hazard (deaths per rule-step)")
+    plt.title("Rule Death Hazard by Birth Time")
+    plt.grid(True, alpha=0.1)
+    
+    if save_path:
+        plt.savefig(save_path)
+    else:
+        plt.show()
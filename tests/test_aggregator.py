@@ -0,0 +1,28 @@
+import numpy as np
+from lucidmind.metrics.aggregator import StreamingAggregator, PERCENTILES
+
+
+def _shard(n_runs, seed, T=50, k=8):
+    rng = np.random.default_rng(seed)
+    agg = StreamingAggregator(k=k, seed=seed)
+    for _ in range(n_runs):
+        agg.add({'x': rng.normal(size=T)})
+    return agg
+
+
+def test_merge_into_empty_reproduces_shard():
+    shard = _shard(8, seed=1)
+    merged = StreamingAggregator(k=8).merge(shard)
+    expected, got = shard.result()['x'], merged.result()['x']
+    for q in PERCENTILES:
+        np.testing.assert_allclose(got[f'p{q}'], expected[f'p{q}'])
+    np.testing.assert_allclose(got['mean'], expected['mean'])
+    np.testing.assert_array_equal(got['count'], expected['count'])
+
+
+def test_merge_shards_of_different_depths():
+    shallow, deep = _shard(1, seed=2), _shard(32, seed=3)
+    assert len(deep.sketches['x'].levels) > len(shallow.sketches['x'].levels)
+    merged = shallow.merge(deep).result()['x']
+    np.testing.assert_array_equal(merged['count'], np.full(50, 33))
+    assert np.all(merged['p5'] <= merged['p50']) and np.all(merged['p50'] <= merged['p95'])
@@ -0,0 +1,46 @@
+import os
+import signal
+import pytest
+from lucidmind.experiments.queue import JobQueue
+
+_PARENT = os.getpid()
+
+
+def _crash_once_in_worker(task):
+    marker, i = task
+    if os.getpid() != _PARENT:
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            pass
+        else:
+            # Dies mid-job without reporting, like an OOM kill
+            os._exit(1)
+    return i * i
+
+
+def _timeout(signum, frame):
+    raise TimeoutError("JobQueue.run did not finish")
+
+
+def test_run_requeues_job_of_crashed_worker(tmp_path):
+    marker = str(tmp_path / "crashed")
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    previous = signal.signal(signal.SIGALRM, _timeout)
+    signal.alarm(30)
+    try:
+        results = queue.run(
+            _crash_once_in_worker, [(marker, i) for i in range(20)],
+            workers=3, progress=False, poll_interval=0.05
+        )
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+    assert os.path.exists(marker)
+    assert results == [i * i for i in range(20)]
+
+
+def test_failed_jobs_raise(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    with pytest.raises(RuntimeError, match="1 of 3 jobs failed"):
+        queue.run(lambda x: 1 // x, [1, 0, 2], progress=False)